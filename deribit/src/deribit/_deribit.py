@@ -1,7 +1,10 @@
-from typing_extensions import Literal
-from dataclasses import dataclass
+from typing_extensions import Literal, Self
+from dataclasses import dataclass, replace
 from functools import cached_property
+import asyncio
 
+from deribit.core import AuthedClient, ApiResponse, validator
+from deribit.core.ratelimit import MATCHING_ENGINE_METHODS
 from . import MarketData, Trading, Account, Wallet, Subscriptions
 
 @dataclass(frozen=True)
@@ -11,6 +14,32 @@ class Deribit(
   Account,
   Wallet,
 ):
+  orders: AuthedClient | None = None
+  """If given, trading requests (`buy`, `sell`, `edit`, `cancel`...) go through this client, so that order acknowledgements don't queue behind market data on `client`'s connection."""
+
+  @classmethod
+  def new(
+    cls, client_id: str | None = None, client_secret: str | None = None, *,
+    validate: bool = True, mainnet: bool = True, protocol: Literal['http', 'ws'] = 'ws',
+    order_entry: bool = False,
+  ):
+    """Create a client from the given credentials (or the environment).
+    
+    - `order_entry`: open a dedicated WebSocket connection (without subscriptions) for trading requests.
+    """
+    self = super().new(client_id, client_secret, validate=validate, mainnet=mainnet, protocol=protocol)
+    if not order_entry:
+      return self
+    from deribit.core import AuthedSocketClient, UserError
+    client = self.client
+    if not isinstance(client, AuthedSocketClient):
+      raise UserError('Use WebSockets for a dedicated order entry connection')
+    orders = AuthedSocketClient(
+      client.client_id, client.client_secret, validate=validate,
+      domain=client.domain, limiter=client.limiter, session_auth=True,
+    )
+    return replace(self, orders=orders)
+
   @cached_property
   def subscriptions(self) -> Subscriptions:
     from deribit.core import AuthedSocketClient, UserError
@@ -19,4 +48,20 @@ class Deribit(
     else:
       raise UserError('Use WebSockets to access subscriptions')
 
-  
\ No newline at end of file
+  async def authed_request(
+    self, path: str, params=None, /, *,
+    result: validator | None = None, validate: bool | None = None,
+  ) -> ApiResponse:
+    client = self.orders if self.orders is not None and path in MATCHING_ENGINE_METHODS else self.client
+    return await client.authed_request(path, params, result=result if self.validate(validate) else None)
+
+  async def __aenter__(self) -> Self:
+    if self.orders is None:
+      return await super().__aenter__()
+    await asyncio.gather(self.client.__aenter__(), self.orders.__aenter__())
+    return self
+  
+  async def __aexit__(self, exc_type, exc_value, traceback):
+    await super().__aexit__(exc_type, exc_value, traceback)
+    if self.orders is not None:
+      await self.orders.__aexit__(exc_type, exc_value, traceback)
@@ -25,8 +25,5 @@ class GetAccountSummaries(AuthedClientMixin):
     > [Deribit API docs](https://docs.deribit.com/#private-get_account_summaries)
     """
     params = {'subaccount_id': subaccount_id} if subaccount_id is not None else None
-    r = await self.authed_request('/private/get_account_summaries', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.authed_request('/private/get_account_summaries', params, result=validate_response, validate=validate)
     
\ No newline at end of file
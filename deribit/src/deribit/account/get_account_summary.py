@@ -37,8 +37,5 @@ class GetAccountSummary(AuthedClientMixin):
     params = {'currency': currency}
     if subaccount_id is not None:
       params['subaccount_id'] = subaccount_id
-    r = await self.authed_request('/private/get_account_summary', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.authed_request('/private/get_account_summary', params, result=validate_response, validate=validate)
     
\ No newline at end of file
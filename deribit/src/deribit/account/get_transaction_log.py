@@ -74,10 +74,7 @@ class GetTransactionLog(AuthedClientMixin):
       params['count'] = count
     if continuation is not None:
       params['continuation'] = continuation
-    r = await self.authed_request('/private/get_transaction_log', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.authed_request('/private/get_transaction_log', params, result=validate_response, validate=validate)
     
   async def get_transaction_log_paged(
     self, currency: str, *,
@@ -0,0 +1,2 @@
+import lazy_loader as lazy
+__getattr__, __dir__, __all__ = lazy.attach_stub(__name__, __file__)
\ No newline at end of file
@@ -0,0 +1,10 @@
+from .local import LocalOrderBook, BookSide
+from .arrays import BookArrays
+from .manager import BookManager
+
+__all__ = [
+  'LocalOrderBook',
+  'BookSide',
+  'BookArrays',
+  'BookManager',
+]
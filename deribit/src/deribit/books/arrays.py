@@ -0,0 +1,119 @@
+from typing_extensions import Any, Literal, Sequence, Mapping
+from dataclasses import dataclass
+import numpy as np
+import numpy.typing as npt
+
+Side = Literal['buy', 'sell']
+
+RTOL = 1e-12
+"""Relative tolerance when comparing cumulative sums to a target, which float rounding may leave slightly short (e.g. `0.1 + 0.2 < 0.3`)."""
+
+def columns(levels: Sequence[Sequence[Any]], depth: int | None, dtype) -> tuple[np.ndarray, np.ndarray]:
+  # levels are `[price, amount]` or `[action, price, amount]`
+  levels = levels[:depth]
+  px = np.fromiter((level[-2] for level in levels), dtype=dtype, count=len(levels))
+  sz = np.fromiter((level[-1] for level in levels), dtype=dtype, count=len(levels))
+  return px, sz
+
+def pad(xs: Sequence[np.ndarray], width: int, fill) -> np.ndarray:
+  out = np.full((len(xs), width), fill, dtype=np.result_type(*xs) if xs else np.float64)
+  for i, x in enumerate(xs):
+    out[i, :len(x)] = x
+  return out
+
+@dataclass(frozen=True)
+class BookArrays:
+  """Order book as contiguous price and amount columns, best level first. Requires `numpy` (`pip install deribit-trading-sdk[numpy]`).
+
+  Columns are either 1D (a single book) or 2D (a book per row, see `stack`; missing levels have a `nan` price and zero amount). The analytics are vectorized over the levels, and over the rows and the given sizes.
+  """
+  bid_px: npt.NDArray
+  bid_sz: npt.NDArray
+  ask_px: npt.NDArray
+  ask_sz: npt.NDArray
+
+  @classmethod
+  def from_levels(
+    cls, bids: Sequence[Sequence[Any]], asks: Sequence[Sequence[Any]], *,
+    depth: int | None = None, dtype: npt.DTypeLike = np.float64,
+  ) -> 'BookArrays':
+    """Build from lists of levels, best first (e.g. `BookEntry`s, or `(price, amount)` pairs).
+    
+    - `depth`: maximum number of levels per side.
+    - `dtype`: `float64` by default, or `int64` for books decoded as `Ticks`.
+    """
+    bid_px, bid_sz = columns(bids, depth, dtype)
+    ask_px, ask_sz = columns(asks, depth, dtype)
+    return cls(bid_px, bid_sz, ask_px, ask_sz)
+
+  @classmethod
+  def from_book(cls, book: Mapping[str, Any], *, depth: int | None = None, dtype: npt.DTypeLike = np.float64) -> 'BookArrays':
+    """Build from an `OrderBook` (as returned by `get_order_book` or the `depth` subscription)."""
+    return cls.from_levels(book['bids'], book['asks'], depth=depth, dtype=dtype)
+
+  @classmethod
+  def stack(cls, books: Sequence['BookArrays'], depth: int | None = None) -> 'BookArrays':
+    """Stack 1D books into 2D columns (a row per book), padded to `depth` levels (defaults to the deepest side)."""
+    width = depth or max((max(len(b.bid_px), len(b.ask_px)) for b in books), default=0)
+    return cls(
+      pad([b.bid_px[:width].astype(np.float64) for b in books], width, np.nan),
+      pad([b.bid_sz[:width] for b in books], width, 0),
+      pad([b.ask_px[:width].astype(np.float64) for b in books], width, np.nan),
+      pad([b.ask_sz[:width] for b in books], width, 0),
+    )
+
+  def side(self, side: Side) -> tuple[npt.NDArray, npt.NDArray]:
+    """Levels consumed by an order of `side` (asks for buys, bids for sells)."""
+    return (self.ask_px, self.ask_sz) if side == 'buy' else (self.bid_px, self.bid_sz)
+
+  def best(self, px: npt.NDArray) -> npt.NDArray:
+    return px[..., 0] if px.shape[-1] else np.full(px.shape[:-1], np.nan)
+
+  def mid(self) -> npt.NDArray:
+    return (self.best(self.bid_px) + self.best(self.ask_px)) / 2
+
+  def spread(self) -> npt.NDArray:
+    return self.best(self.ask_px) - self.best(self.bid_px)
+
+  def microprice(self) -> npt.NDArray:
+    """Mid weighted by the opposite side's top amount: `(bid*ask_size + ask*bid_size) / (bid_size + ask_size)`."""
+    bid, ask = self.best(self.bid_px), self.best(self.ask_px)
+    bid_sz, ask_sz = self.best(self.bid_sz), self.best(self.ask_sz)
+    return (bid * ask_sz + ask * bid_sz) / (bid_sz + ask_sz)
+
+  def cumulative(self, side: Side) -> tuple[npt.NDArray, npt.NDArray]:
+    """Cumulative `(amount, notional)` up to each level consumed by an order of `side`."""
+    px, sz = self.side(side)
+    return np.cumsum(sz, axis=-1), np.cumsum(np.nan_to_num(px * sz), axis=-1)
+
+  def vwap(self, side: Side, size) -> npt.NDArray:
+    """Average fill price of an order of `side` for `size` (`nan` if the book is not deep enough).
+    
+    `size` may be an array, e.g. to compute a slippage curve, or a size per stacked book.
+    """
+    px, sz = self.side(side)
+    size = np.asarray(size, dtype=np.float64)[..., None]
+    before = np.cumsum(sz, axis=-1) - sz
+    take = np.clip(size - before, 0, sz)
+    filled = take.sum(axis=-1)
+    cost = (take * np.nan_to_num(px)).sum(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+      return np.where(filled >= size[..., 0] * (1 - RTOL), cost / filled, np.nan)
+
+  def slippage(self, side: Side, size) -> npt.NDArray:
+    """Distance from the mid to the `vwap`, positive when the fill is worse than the mid."""
+    sign = 1 if side == 'buy' else -1
+    return sign * (self.vwap(side, size) - self.mid())
+
+  def impact_price(self, side: Side, notional) -> npt.NDArray:
+    """Price of the last level reached by an order of `side` for `notional` (in price times amount units; `nan` if the book is not deep enough)."""
+    px, _ = self.side(side)
+    _, cum = self.cumulative(side)
+    notional = np.asarray(notional, dtype=np.float64)[..., None]
+    idx = (cum < notional * (1 - RTOL)).sum(axis=-1)
+    levels = px.shape[-1]
+    if levels == 0:
+      return np.full(idx.shape, np.nan)
+    px = np.broadcast_to(px, idx.shape + (levels,))
+    reached = np.take_along_axis(px, np.minimum(idx, levels-1)[..., None], axis=-1)[..., 0]
+    return np.where(idx < levels, reached, np.nan)
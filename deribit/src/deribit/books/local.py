@@ -0,0 +1,196 @@
+from typing_extensions import Any, Iterator
+from dataclasses import dataclass, field
+from datetime import timedelta
+from bisect import bisect_left
+import asyncio
+import logging
+
+from deribit.core import SocketClient, Client, validator, ApiError
+from deribit.core.numeric import Numeric, Ticks, numeric_validator
+from deribit.subscriptions.public.depth_updates import OrderBookMessage, validate_message
+
+logger = logging.getLogger('deribit.books')
+
+@dataclass(eq=False)
+class BookSide:
+  """Price levels of one side of a book.
+  
+  Levels are kept in a dict, and their prices in a sorted list (with `bisect`), ordered so that the best price is last: updates near the top of the book (the most frequent) barely move the list, and the best level is read in O(1).
+
+  - `sign`: `1` for bids, `-1` for asks.
+  """
+  sign: int
+  levels: dict[Any, Any] = field(default_factory=dict, repr=False)
+  keys: list[Any] = field(default_factory=list, repr=False)
+
+  def update(self, price, amount):
+    """Set the `amount` at `price` (removing the level if it's zero)."""
+    if not amount:
+      self.remove(price)
+    elif price in self.levels:
+      self.levels[price] = amount
+    else:
+      self.levels[price] = amount
+      key = self.sign * price
+      self.keys.insert(bisect_left(self.keys, key), key)
+
+  def remove(self, price):
+    if self.levels.pop(price, None) is not None:
+      key = self.sign * price
+      del self.keys[bisect_left(self.keys, key)]
+
+  def clear(self):
+    self.levels.clear()
+    self.keys.clear()
+
+  def best(self) -> tuple[Any, Any] | None:
+    """Best `(price, amount)`, if any."""
+    if self.keys:
+      price = self.sign * self.keys[-1]
+      return price, self.levels[price]
+
+  def top(self, n: int | None = None) -> list[tuple[Any, Any]]:
+    """Best `n` levels (or all of them), best first."""
+    keys = self.keys if n is None else self.keys[-n:]
+    return [(self.sign * k, self.levels[self.sign * k]) for k in reversed(keys)]
+
+  def __len__(self) -> int:
+    return len(self.keys)
+
+  def __iter__(self) -> Iterator[tuple[Any, Any]]:
+    for k in reversed(self.keys):
+      yield self.sign * k, self.levels[self.sign * k]
+
+@dataclass(eq=False)
+class LocalOrderBook:
+  """Order book maintained from the `book.{instrument_name}.raw` snapshot and updates.
+
+  Updates are chained by `prev_change_id`: if one is missed, the book is marked as out of sync (`synced = False`) and resynchronized from `get_order_book`.
+
+  - `numeric`: how to decode prices and amounts (see `numeric_validator`). Integer `Ticks` make updates and comparisons cheapest. Only applies when validating.
+  - `resync_depth`: number of levels to fetch when resynchronizing.
+
+  Run `run(client)` to maintain it, or feed it messages with `apply`.
+  """
+  instrument_name: str
+  numeric: Numeric | Ticks = 'decimal'
+  validate: bool = True
+  resync_depth: int = 1000
+  bids: BookSide = field(default_factory=lambda: BookSide(1), init=False)
+  asks: BookSide = field(default_factory=lambda: BookSide(-1), init=False)
+  change_id: int | None = field(default=None, init=False)
+  timestamp: int | None = field(default=None, init=False)
+  synced: bool = field(default=False, init=False)
+  changed: asyncio.Event = field(default_factory=asyncio.Event, init=False, repr=False)
+
+  @property
+  def channel(self) -> str:
+    return f'book.{self.instrument_name}.raw'
+
+  @property
+  def parser(self) -> validator | None:
+    return numeric_validator(validate_message, self.numeric) if self.validate else None
+
+  @property
+  def ticks(self) -> Ticks | None:
+    """Scale of the prices and amounts, if they're decoded as integer `Ticks`."""
+    if self.parser is not None and isinstance(self.numeric, Ticks):
+      return self.numeric
+
+  @property
+  def best_bid(self) -> tuple[Any, Any] | None:
+    return self.bids.best()
+
+  @property
+  def best_ask(self) -> tuple[Any, Any] | None:
+    return self.asks.best()
+
+  def mid(self):
+    if (bid := self.bids.best()) is not None and (ask := self.asks.best()) is not None:
+      return (bid[0] + ask[0]) / 2
+
+  def spread(self):
+    if (bid := self.bids.best()) is not None and (ask := self.asks.best()) is not None:
+      return ask[0] - bid[0]
+
+  def arrays(self, depth: int | None = None):
+    """Snapshot of the best `depth` levels as NumPy columns (see `BookArrays`): `int64` for `Ticks` books, `float64` otherwise."""
+    import numpy as np
+    from .arrays import BookArrays
+    dtype = np.int64 if self.ticks is not None else np.float64
+    return BookArrays.from_levels(self.bids.top(depth), self.asks.top(depth), dtype=dtype)
+
+  def load(self, book: Any):
+    """Replace the book with a snapshot: a `snapshot` message, or a `get_order_book` result."""
+    self.bids.clear()
+    self.asks.clear()
+    for side, levels in ((self.bids, book['bids']), (self.asks, book['asks'])):
+      for level in levels:
+        # snapshot messages are `[action, price, amount]`, get_order_book's levels `[price, amount]`
+        side.update(level[-2], level[-1])
+    self.change_id = book['change_id']
+    self.timestamp = book.get('timestamp')
+    self.synced = True
+    self.changed.set()
+
+  def apply(self, msg: OrderBookMessage) -> bool:
+    """Apply a message of the `book.{instrument_name}.raw` channel. Returns `False` if a gap was detected (the book is then out of sync)."""
+    if msg['type'] == 'snapshot':
+      self.load(msg)
+      return True
+    if not self.synced or msg['change_id'] <= self.change_id: # type: ignore
+      # stale (e.g. queued before a resync snapshot), or waiting for a resync
+      return self.synced
+    if msg.get('prev_change_id') != self.change_id:
+      logger.warning('Gap in %s: expected prev_change_id %s, got %s', self.channel, self.change_id, msg.get('prev_change_id'))
+      self.synced = False
+      return False
+    for side, levels in ((self.bids, msg['bids']), (self.asks, msg['asks'])):
+      for action, price, amount in levels:
+        if action == 'delete':
+          side.remove(price)
+        else:
+          side.update(price, amount)
+    self.change_id = msg['change_id']
+    self.timestamp = msg['timestamp']
+    self.changed.set()
+    return True
+
+  async def resync(self, client: Client, *, retries: int = 5, delay: timedelta = timedelta(milliseconds=100)):
+    """Reload the book from `get_order_book`."""
+    from deribit import MarketData
+    market = MarketData(client)
+    for attempt in range(retries):
+      try:
+        r = await market.get_order_book(self.instrument_name, depth=self.resync_depth, validate=self.validate, numeric=self.numeric)
+        if 'error' in r:
+          raise ApiError(r['error'])
+        self.load(r['result'])
+        logger.info('Resynchronized %s at change_id %s', self.channel, self.change_id)
+        return
+      except Exception as e:
+        logger.warning('Failed to resynchronize %s (%s). Retrying', self.channel, e)
+        await asyncio.sleep(delay.total_seconds() * 2**attempt)
+    raise ApiError(f'Failed to resynchronize {self.channel}')
+
+  async def run(self, client: SocketClient):
+    """Subscribe to the book's channel and keep the book up to date (until cancelled), resynchronizing on gaps (raising if it fails)."""
+    _, subscriber = await client.subscribe(self.channel, self.parser)
+    resync: asyncio.Task | None = None
+    try:
+      async for msg in subscriber:
+        if resync is not None and resync.done():
+          resync.result() # raises if the resync failed
+          resync = None
+        if not self.apply(msg) and resync is None:
+          # resync in a task, skipping the updates meanwhile: awaiting it here would deadlock a blocking subscriber (its reply is read by the blocked listener)
+          resync = asyncio.create_task(self.resync(client))
+    finally:
+      if resync is not None:
+        resync.cancel()
+      await client.unsubscribe(self.channel, subscriber)
+  
+  async def wait(self):
+    """Wait for the next change to the book."""
+    self.changed.clear()
+    await self.changed.wait()
@@ -0,0 +1,147 @@
+from typing_extensions import Literal
+from dataclasses import dataclass, field
+import asyncio
+
+from deribit.core import SocketClient, UserError, ApiError
+from deribit.core.numeric import Numeric, Ticks, numeric_validator
+from deribit.subscriptions.public.depth import validate_message as validate_book
+from deribit.subscriptions.public.depth_updates import validate_message as validate_book_message
+from .local import LocalOrderBook, logger
+
+@dataclass(eq=False)
+class BookSink:
+  """Stands in for a subscriber: the client hands it each notification of `channel`, which is applied to the book right away."""
+  manager: 'BookManager'
+  book: LocalOrderBook
+  channel: str
+  raw: bool
+
+  def put(self, msg):
+    self.manager.on_msg(self, msg)
+
+  def close(self, exc: Exception | None = None):
+    ...
+
+@dataclass(eq=False)
+class BookManager:
+  """Keeps many order books in sync over a single connection.
+
+  Notifications are applied directly from the client's listener, through its table of subscribers by channel: there is no task, queue or generator per instrument. Batch consumers `poll()` (or `wait()` for) the set of instruments whose books changed since the last poll.
+
+  - `interval`: `'raw'` maintains the full books from incremental updates (resynchronizing on gaps). Otherwise, the books are replaced by each notification of `book.{instrument}.{group}.{depth}.{interval}`.
+  - `numeric`: how to decode prices and amounts (see `numeric_validator`). Only applies when validating.
+  """
+  client: SocketClient
+  interval: Literal['raw', '100ms', 'agg2'] = 'raw'
+  group: int | Literal['none'] = 'none'
+  depth: int = 20
+  numeric: Numeric | Ticks = 'decimal'
+  validate: bool = True
+  books: dict[str, LocalOrderBook] = field(default_factory=dict, init=False, repr=False)
+  sinks: dict[str, BookSink] = field(default_factory=dict, init=False, repr=False)
+  changed: set[str] = field(default_factory=set, init=False, repr=False)
+  ready: asyncio.Event = field(default_factory=asyncio.Event, init=False, repr=False)
+  resyncs: dict[str, asyncio.Task] = field(default_factory=dict, init=False, repr=False)
+
+  def channel(self, instrument_name: str) -> str:
+    if self.interval == 'raw':
+      return f'book.{instrument_name}.raw'
+    return f'book.{instrument_name}.{self.group}.{self.depth}.{self.interval}'
+
+  @property
+  def parser(self):
+    if not self.validate:
+      return None
+    validate = validate_book_message if self.interval == 'raw' else validate_book
+    return numeric_validator(validate, self.numeric)
+
+  async def track(self, *instrument_names: str):
+    """Start maintaining the books of `instrument_names` (subscribing to all of them at once). Raises the first failed subscription, whose books are not tracked."""
+    new = [name for name in instrument_names if name not in self.books]
+    for name in new:
+      book = self.books[name] = LocalOrderBook(name, numeric=self.numeric, validate=self.validate)
+      channel = self.channel(name)
+      self.sinks[channel] = BookSink(self, book, channel, raw=self.interval == 'raw')
+    parser = self.parser
+    # concurrent subscriptions are coalesced by the client into bulk requests
+    results = await asyncio.gather(*(
+      self.client.attach(channel, [self.sinks[channel]], parser)
+      for channel in map(self.channel, new)
+    ), return_exceptions=True)
+    errors: list[BaseException] = []
+    attached: list[BookSink] = []
+    for name, r in zip(new, results):
+      channel = self.channel(name)
+      if isinstance(r, BaseException):
+        error = r
+      elif 'error' in r:
+        error = ApiError(r['error'])
+      elif channel not in r['result']:
+        error = ApiError(f'Subscription to {channel} not confirmed')
+      else:
+        continue
+      # drop the book, so that tracking it again retries
+      errors.append(error)
+      del self.books[name]
+      sink = self.sinks.pop(channel)
+      if not isinstance(error, UserError): # e.g. the channel is already consumed with another `numeric`: never attached
+        attached.append(sink)
+    if attached:
+      await asyncio.gather(*(self.client.unsubscribe(sink.channel, sink) for sink in attached), return_exceptions=True)
+    if errors:
+      raise errors[0]
+
+  async def untrack(self, *instrument_names: str):
+    for name in instrument_names:
+      if (book := self.books.pop(name, None)) is None:
+        continue
+      if (task := self.resyncs.pop(name, None)) is not None:
+        task.cancel()
+      self.changed.discard(name)
+    channels = [self.channel(name) for name in instrument_names]
+    await asyncio.gather(*(
+      self.client.unsubscribe(channel, self.sinks.pop(channel))
+      for channel in channels if channel in self.sinks
+    ))
+
+  def __getitem__(self, instrument_name: str) -> LocalOrderBook:
+    return self.books[instrument_name]
+
+  def on_msg(self, sink: BookSink, msg):
+    book = sink.book
+    if not sink.raw:
+      book.load(msg)
+    elif not book.apply(msg):
+      if book.instrument_name not in self.resyncs:
+        self.resyncs[book.instrument_name] = asyncio.create_task(self.resync(book))
+      return
+    elif not book.synced:
+      return
+    self.changed.add(book.instrument_name)
+    self.ready.set()
+
+  async def resync(self, book: LocalOrderBook):
+    try:
+      await book.resync(self.client)
+      self.changed.add(book.instrument_name)
+      self.ready.set()
+    except Exception:
+      logger.exception('Failed to resynchronize %s', book.instrument_name)
+    finally:
+      self.resyncs.pop(book.instrument_name, None)
+
+  def poll(self) -> set[str]:
+    """Instruments whose books changed since the last poll."""
+    changed, self.changed = self.changed, set()
+    self.ready.clear()
+    return changed
+
+  async def wait(self) -> set[str]:
+    """Wait until some book changes, then `poll()`."""
+    while not self.changed:
+      self.ready.clear()
+      await self.ready.wait()
+    return self.poll()
+
+  async def close(self):
+    await self.untrack(*list(self.books))
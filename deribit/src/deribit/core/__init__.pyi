@@ -3,11 +3,14 @@ from .validation import validator
 from .client import (
   Client, AuthedClient,
   ClientMixin, AuthedClientMixin,
-  ApiResponse, OkResponse, ErrorResponse, ErrorData, validate_response,
+  ApiResponse, OkResponse, ErrorResponse, ErrorData, validate_response, response_validator,
   DERIBIT_MAINNET, DERIBIT_TESTNET, DERIBIT_HISTORY
 )
+from .ratelimit import RateLimiter, TokenBucket
+from .jsonlib import JsonBackend, json_backend
+from .numeric import Numeric, Ticks, numeric_validator, to_decimal
 from .util import timestamp, round2tick, trunc2tick, filter_kwargs, path_join, getenv
-from .ws import SocketClient, AuthedSocketClient, SocketMixin, AuthedSocketMixin
+from .ws import SocketClient, AuthedSocketClient, SocketMixin, AuthedSocketMixin, SocketPool
 from .http import HttpClient, AuthedHTTPClient
 from . import http, ws
 
@@ -16,10 +19,13 @@ __all__ = [
   'validator',
   'Client', 'AuthedClient',
   'ClientMixin', 'AuthedClientMixin',
-  'ApiResponse', 'OkResponse', 'ErrorResponse', 'ErrorData', 'validate_response',
+  'ApiResponse', 'OkResponse', 'ErrorResponse', 'ErrorData', 'validate_response', 'response_validator',
   'DERIBIT_MAINNET', 'DERIBIT_TESTNET', 'DERIBIT_HISTORY',
+  'RateLimiter', 'TokenBucket',
+  'JsonBackend', 'json_backend',
+  'Numeric', 'Ticks', 'numeric_validator', 'to_decimal',
   'timestamp', 'round2tick', 'trunc2tick', 'filter_kwargs', 'path_join', 'getenv',
-  'SocketClient', 'AuthedSocketClient', 'SocketMixin', 'AuthedSocketMixin',
+  'SocketClient', 'AuthedSocketClient', 'SocketMixin', 'AuthedSocketMixin', 'SocketPool',
   'HttpClient', 'AuthedHTTPClient',
   'http', 'ws',
 ]
\ No newline at end of file
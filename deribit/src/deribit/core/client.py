@@ -1,8 +1,11 @@
 from typing_extensions import TypedDict, NotRequired, Any, Self, Literal, TypeVar, Generic
 from dataclasses import dataclass, field
+from functools import cache
 from abc import ABC, abstractmethod
 from .validation import validator
 from .util import getenv
+from .ratelimit import RateLimiter
+from .jsonlib import JsonBackend, json_backend
 
 T = TypeVar('T', default=Any)
 
@@ -25,6 +28,11 @@ ApiResponse = OkResponse[T] | ErrorResponse
 ApiResponseT: type[ApiResponse] = ApiResponse # type: ignore
 validate_response = validator(ApiResponseT)
 
+@cache
+def response_validator(Result) -> validator[ApiResponse]:
+  """Validator for whole responses with a `Result`-typed result, so that they're validated in a single pass."""
+  return validator(OkResponse[Result] | ErrorResponse) # type: ignore
+
 DERIBIT_MAINNET = 'www.deribit.com'
 DERIBIT_HISTORY = 'history.deribit.com'
 DERIBIT_TESTNET = 'test.deribit.com'
@@ -32,13 +40,15 @@ DERIBIT_TESTNET = 'test.deribit.com'
 @dataclass
 class Client(ABC):
   validate: bool = field(kw_only=True, default=True)
+  limiter: RateLimiter = field(kw_only=True, default_factory=RateLimiter, repr=False)
+  json: JsonBackend = field(kw_only=True, default_factory=json_backend, repr=False)
 
   @abstractmethod
-  async def request(self, path: str, params=None, /) -> ApiResponse:
-    ...
+  async def request(self, path: str, params=None, /, *, result: validator | None = None) -> ApiResponse:
+    """Send a request. If given, the response is validated against `result` (along with the rest of the response)."""
   
-  async def get(self, path: str, params=None, /) -> ApiResponse:
-    return await self.request(path, params)
+  async def get(self, path: str, params=None, /, *, result: validator | None = None) -> ApiResponse:
+    return await self.request(path, params, result=result)
 
   @abstractmethod
   async def __aenter__(self) -> Self:
@@ -50,7 +60,7 @@ class Client(ABC):
 
 class AuthedClient(Client):
   @abstractmethod
-  async def authed_request(self, path: str, params=None, /) -> ApiResponse:
+  async def authed_request(self, path: str, params=None, /, *, result: validator | None = None) -> ApiResponse:
     ...
 
 @dataclass(frozen=True)
@@ -75,11 +85,17 @@ class ClientMixin:
   def validate(self, validate: bool | None = None) -> bool:
     return self.client.validate if validate is None else validate
 
-  async def request(self, path: str, params=None, /) -> ApiResponse:
-    return await self.client.request(path, params)
+  async def request(
+    self, path: str, params=None, /, *,
+    result: validator | None = None, validate: bool | None = None,
+  ) -> ApiResponse:
+    return await self.client.request(path, params, result=result if self.validate(validate) else None)
   
-  async def get(self, path: str, params=None, /) -> ApiResponse:
-    return await self.client.get(path, params)
+  async def get(
+    self, path: str, params=None, /, *,
+    result: validator | None = None, validate: bool | None = None,
+  ) -> ApiResponse:
+    return await self.client.get(path, params, result=result if self.validate(validate) else None)
   
   async def __aenter__(self) -> Self:
     await self.client.__aenter__()
@@ -92,8 +108,11 @@ class ClientMixin:
 class AuthedClientMixin(ClientMixin):
   client: AuthedClient
 
-  async def authed_request(self, path: str, params=None, /) -> ApiResponse:
-    return await self.client.authed_request(path, params)
+  async def authed_request(
+    self, path: str, params=None, /, *,
+    result: validator | None = None, validate: bool | None = None,
+  ) -> ApiResponse:
+    return await self.client.authed_request(path, params, result=result if self.validate(validate) else None)
   
   @classmethod
   def new(
@@ -110,10 +129,12 @@ class AuthedClientMixin(ClientMixin):
       client_secret = client_secret or getenv('TEST_DERIBIT_CLIENT_SECRET')
       domain = DERIBIT_TESTNET
     
+    # HTTP and WS clients of the same account share their rate limits
+    limiter = RateLimiter.shared(f'{domain}/{client_id}')
     if protocol == 'http':
       from deribit.core import AuthedHTTPClient
-      client = AuthedHTTPClient(client_id, client_secret, validate=validate, domain=domain)
+      client = AuthedHTTPClient(client_id, client_secret, validate=validate, domain=domain, limiter=limiter)
     else:
       from deribit.core import AuthedSocketClient
-      client = AuthedSocketClient.new(mainnet=mainnet, validate=validate)
+      client = AuthedSocketClient(client_id, client_secret, validate=validate, domain=domain, limiter=limiter)
     return cls(client)
\ No newline at end of file
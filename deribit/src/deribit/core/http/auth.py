@@ -2,11 +2,10 @@ from dataclasses import dataclass, field
 import hmac
 import hashlib
 from uuid import uuid4
-import json
 import httpx
 
 from deribit.core import (
-  timestamp, AuthedClient, ApiResponse, path_join, validate_response,
+  timestamp, AuthedClient, ApiResponse, path_join, validator,
   NetworkError
 )
 from .client import HttpClient
@@ -15,7 +14,9 @@ def sign(data: bytes, *, secret: str):
   return hmac.new(secret.encode(), data, hashlib.sha256).hexdigest()
 
 def signature_data(*, http_method: str, uri: str, body: str|bytes, ts: int, nonce: str):
-  return f'{ts}\n{nonce}\n{http_method}\n{uri}\n{body}\n'.encode()
+  if isinstance(body, str):
+    body = body.encode()
+  return f'{ts}\n{nonce}\n{http_method}\n{uri}\n'.encode() + body + b'\n'
 
 @dataclass
 class AuthedHTTPClient(HttpClient, AuthedClient):
@@ -33,23 +34,26 @@ class AuthedHTTPClient(HttpClient, AuthedClient):
     return f'deri-hmac-sha256 id={self.client_id},ts={ts},sig={signature},nonce={nonce}'
   
   @HttpClient.with_client
-  async def authed_request(self, path: str, params=None) -> ApiResponse:
+  async def authed_request(self, path: str, params=None, *, result: validator | None = None) -> ApiResponse:
     msg = {
       'jsonrpc': '2.0',
       'method': path,
     }
     if params is not None:
       msg['params'] = params
-    body = json.dumps(msg)
+    body = self.json.dumps(msg)
     uri = path_join(self.base_path, path)
     url = path_join(self.base_url, path)
-    auth_header = self.auth_header(http_method='POST', body=body, uri=uri)
-    try:
-      r = await self.client.post(url, content=body, headers={
-        'Authorization': auth_header,
-        'Content-Type': 'application/json',
-        'User-Agent': 'trading-sdk',
-      })
-      return validate_response(r.text) if self.validate else json.loads(r.text)
-    except httpx.HTTPError as e:
-      raise NetworkError from e
+    async def request():
+      # signed per attempt: retries need a fresh timestamp and nonce
+      auth_header = self.auth_header(http_method='POST', body=body, uri=uri)
+      try:
+        r = await self.client.post(url, content=body, headers={
+          'Authorization': auth_header,
+          'Content-Type': 'application/json',
+          'User-Agent': 'trading-sdk',
+        })
+        return self.parse(r.content, result)
+      except httpx.HTTPError as e:
+        raise NetworkError from e
+    return await self.limiter.run(path, request)
@@ -3,8 +3,8 @@ from functools import wraps
 import httpx
 
 from deribit.core import (
-  Client, ApiResponse, DERIBIT_MAINNET, path_join, validate_response,
-  UserError, NetworkError
+  Client, ApiResponse, DERIBIT_MAINNET, path_join, validate_response, response_validator,
+  validator, UserError, NetworkError
 )
 
 @dataclass
@@ -44,27 +44,40 @@ class HttpClient(Client):
       
     return wrapper
 
+  def parse(self, content: bytes, result: validator | None = None) -> ApiResponse:
+    if result is not None:
+      return response_validator(result.Type)(content)
+    elif self.validate:
+      return validate_response(content)
+    else:
+      return self.json.loads(content)
+
   @with_client
-  async def request(self, path: str, params=None) -> ApiResponse:
-    try:
-      r = await self.client.post(self.base_url, json={
-        'jsonrpc': '2.0',
-        'method': path,
-        'params': params,
-      }, headers={
-        'User-Agent': 'trading-sdk',
-      })
-      return validate_response(r.text) if self.validate else r.json()
-    except httpx.HTTPError as e:
-      raise NetworkError from e
+  async def request(self, path: str, params=None, *, result: validator | None = None) -> ApiResponse:
+    async def request():
+      try:
+        r = await self.client.post(self.base_url, content=self.json.dumps({
+          'jsonrpc': '2.0',
+          'method': path,
+          'params': params,
+        }), headers={
+          'Content-Type': 'application/json',
+          'User-Agent': 'trading-sdk',
+        })
+        return self.parse(r.content, result)
+      except httpx.HTTPError as e:
+        raise NetworkError from e
+    return await self.limiter.run(path, request)
   
   @with_client
-  async def get(self, path: str, params=None) -> ApiResponse:
+  async def get(self, path: str, params=None, *, result: validator | None = None) -> ApiResponse:
     url = path_join(self.base_url, path)
-    try:
-      r = await self.client.get(url, params=params, headers={
-        'User-Agent': 'trading-sdk',
-      })
-      return validate_response(r.text) if self.validate else r.json()
-    except httpx.HTTPError as e:
-      raise NetworkError from e
\ No newline at end of file
+    async def request():
+      try:
+        r = await self.client.get(url, params=params, headers={
+          'User-Agent': 'trading-sdk',
+        })
+        return self.parse(r.content, result)
+      except httpx.HTTPError as e:
+        raise NetworkError from e
+    return await self.limiter.run(path, request)
\ No newline at end of file
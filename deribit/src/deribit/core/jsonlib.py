@@ -0,0 +1,55 @@
+from typing_extensions import Any, Callable, Literal
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import cache
+
+Backend = Literal['orjson', 'json']
+
+def default(obj):
+  if isinstance(obj, Decimal):
+    return str(obj)
+  raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+@dataclass(frozen=True)
+class JsonBackend:
+  """JSON encoder/decoder used by the clients.
+
+  - `dumps`: encodes to `str` or UTF-8 `bytes` (decimals are encoded as strings).
+  - `loads`: decodes from `str`, `bytes`, `bytearray` or `memoryview`.
+  """
+  name: Backend
+  dumps: Callable[[Any], str | bytes]
+  loads: Callable[[str | bytes | bytearray | memoryview], Any]
+
+def stdlib_backend() -> JsonBackend:
+  import json
+
+  def dumps(obj) -> str:
+    return json.dumps(obj, default=default, separators=(',', ':'))
+
+  def loads(data: str | bytes | bytearray | memoryview):
+    if isinstance(data, memoryview):
+      data = bytes(data)
+    return json.loads(data)
+
+  return JsonBackend('json', dumps, loads)
+
+def orjson_backend() -> JsonBackend:
+  import orjson
+
+  def dumps(obj) -> bytes:
+    return orjson.dumps(obj, default=default)
+
+  return JsonBackend('orjson', dumps, orjson.loads)
+
+@cache
+def json_backend(name: Backend | None = None) -> JsonBackend:
+  """Get a JSON backend by name. By default, uses `orjson` if installed (`pip install deribit-trading-sdk[orjson]`), falling back to the standard library."""
+  if name == 'json':
+    return stdlib_backend()
+  elif name == 'orjson':
+    return orjson_backend()
+  try:
+    return orjson_backend()
+  except ImportError:
+    return stdlib_backend()
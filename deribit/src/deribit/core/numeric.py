@@ -0,0 +1,111 @@
+from typing_extensions import (
+  Any, Literal, Union, Annotated, NamedTuple, TypedDict, NotRequired, Required,
+  get_origin, get_args, get_type_hints, is_typeddict,
+)
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import cache, cached_property
+import types
+
+from .validation import validator
+
+Numeric = Literal['decimal', 'float']
+
+@dataclass(frozen=True)
+class Ticks:
+  """Fixed-point scale of an instrument: prices as integer multiples of `tick_size`, and amounts as integer multiples of `amount_step` (e.g. its `contract_size` or `min_trade_amount`).
+
+  Pass it as `numeric` to decode prices and amounts straight into integers, and convert them back to `Decimal` with `to_price`/`to_amount` (e.g. when placing orders).
+  """
+  tick_size: Decimal
+  amount_step: Decimal
+
+  @cached_property
+  def _tick(self) -> float:
+    return float(self.tick_size)
+
+  @cached_property
+  def _step(self) -> float:
+    return float(self.amount_step)
+
+  def price(self, x: float | str | Decimal) -> int:
+    return round(float(x) / self._tick)
+
+  def amount(self, x: float | str | Decimal) -> int:
+    return round(float(x) / self._step)
+
+  def to_price(self, ticks: int) -> Decimal:
+    return (ticks * self.tick_size).normalize()
+
+  def to_amount(self, steps: int) -> Decimal:
+    return (steps * self.amount_step).normalize()
+
+def to_decimal(x: float, step: Decimal) -> Decimal:
+  """Convert a float back to an exact `Decimal`, rounded to a multiple of `step` (e.g. the instrument's tick size)."""
+  return (round(x / float(step)) * step).normalize()
+
+def leaf(numeric: Numeric | Ticks, name: str | None):
+  if isinstance(numeric, Ticks):
+    from pydantic import PlainValidator
+    if name == 'price':
+      return Annotated[int, PlainValidator(numeric.price)]
+    elif name == 'amount':
+      return Annotated[int, PlainValidator(numeric.amount)]
+  return float
+
+def rebuild_tuple(Type, numeric: Numeric | Ticks, values: tuple):
+  return retyped_tuple(Type, numeric)._make(values)
+
+@cache
+def retyped_tuple(Type, numeric: Numeric | Ticks) -> Any:
+  hints = get_type_hints(Type, include_extras=True)
+  Retyped = NamedTuple(Type.__name__, [(k, retype(v, numeric, k)) for k, v in hints.items()]) # type: ignore
+  # the class is built at runtime, so it can't be pickled by reference: pickle its instances by recipe instead (e.g. to decode in a worker process)
+  Retyped.__reduce__ = lambda self: (rebuild_tuple, (Type, numeric, tuple(self)))
+  return Retyped
+
+def retype(Type, numeric: Numeric | Ticks, name: str | None = None) -> Any:
+  """Copy of `Type` with its `Decimal`s replaced by `float`s (or, for `Ticks`, its `price`/`amount` fields by integers)."""
+  if Type is Decimal:
+    return leaf(numeric, name)
+  origin, args = get_origin(Type), get_args(Type)
+  if origin in (Union, types.UnionType):
+    return Union[tuple(retype(arg, numeric, name) for arg in args)] # type: ignore
+  elif origin in (NotRequired, Required):
+    return origin[retype(args[0], numeric, name)]
+  elif origin in (list, tuple):
+    return types.GenericAlias(origin, tuple(retype(arg, numeric) if arg is not Ellipsis else arg for arg in args))
+  elif is_typeddict(Type):
+    hints = get_type_hints(Type, include_extras=True)
+    fields = {
+      k: retype(v if k in Type.__required_keys__ else NotRequired[v], numeric, k) # type: ignore
+      for k, v in hints.items()
+    }
+    return TypedDict(Type.__name__, fields) # type: ignore
+  elif isinstance(Type, type) and issubclass(Type, tuple) and hasattr(Type, '_fields'):
+    return retyped_tuple(Type, numeric)
+  return Type
+
+class RetypedValidator(validator):
+  """Validator of a retyped `Type`, pickled as its recipe (since the retyped classes can't be pickled by reference)."""
+  def __init__(self, Type, numeric: Numeric | Ticks):
+    super().__init__(retype(Type, numeric))
+    self.source = Type
+    self.numeric = numeric
+
+  def __reduce__(self) -> tuple[Any, ...]:
+    return retyped_validator, (self.source, self.numeric)
+
+@cache
+def retyped_validator(Type, numeric: Numeric | Ticks) -> validator:
+  return RetypedValidator(Type, numeric)
+
+def numeric_validator(validate: validator, numeric: Numeric | Ticks = 'decimal') -> validator:
+  """Variant of `validate` decoding numbers as `numeric`:
+  - `'decimal'`: exact `Decimal`s (default)
+  - `'float'`: `float`s (faster to build and compare)
+  - `Ticks(...)`: `price` and `amount` fields as integers, other numbers as `float`s
+  """
+  if numeric == 'decimal':
+    return validate
+  return retyped_validator(validate.Type, numeric)
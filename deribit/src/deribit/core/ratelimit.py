@@ -0,0 +1,113 @@
+from typing_extensions import Callable, Awaitable, ClassVar
+from dataclasses import dataclass, field
+from datetime import timedelta
+import asyncio
+import random
+import time
+import logging
+
+logger = logging.getLogger('deribit.core.ratelimit')
+
+TOO_MANY_REQUESTS = 10028
+
+MATCHING_ENGINE_METHODS = {
+  '/private/buy',
+  '/private/sell',
+  '/private/edit',
+  '/private/edit_by_label',
+  '/private/cancel',
+  '/private/cancel_by_label',
+  '/private/cancel_all',
+  '/private/cancel_all_by_currency',
+  '/private/cancel_all_by_currency_pair',
+  '/private/cancel_all_by_instrument',
+  '/private/cancel_all_by_kind_or_type',
+  '/private/cancel_quotes',
+  '/private/close_position',
+  '/private/mass_quote',
+}
+
+@dataclass
+class TokenBucket:
+  """Token bucket refilled at `rate` credits per second, up to `capacity` credits. Each request costs `cost` credits."""
+  rate: float
+  capacity: float
+  cost: float = 1
+  tokens: float = field(init=False, repr=False)
+  updated: float = field(default_factory=time.monotonic, init=False, repr=False)
+  lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False, repr=False)
+
+  def __post_init__(self):
+    self.tokens = self.capacity
+
+  def refill(self):
+    now = time.monotonic()
+    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+    self.updated = now
+
+  async def acquire(self):
+    # the lock queues waiters in FIFO order, so they don't all wake up at once
+    async with self.lock:
+      self.refill()
+      while self.tokens < self.cost:
+        await asyncio.sleep((self.cost - self.tokens) / self.rate)
+        self.refill()
+      self.tokens -= self.cost
+
+  def drain(self):
+    """Empty the bucket (e.g. after the server reports we're over the limit)."""
+    self.refill()
+    self.tokens = 0
+
+def matching_engine_bucket():
+  return TokenBucket(rate=5, capacity=20)
+
+def non_matching_engine_bucket():
+  return TokenBucket(rate=10_000, capacity=50_000, cost=500)
+
+@dataclass
+class RateLimiter:
+  """Client-side model of Deribit's credit system, with separate matching engine and non-matching engine buckets.
+
+  Requests are paced before being sent. If the server still replies with `too_many_requests`, the request is retried after a jittered exponential backoff, up to `max_retries` times.
+
+  Share the same limiter across the clients (HTTP and WS) of an account, e.g. with `RateLimiter.shared(client_id)`.
+
+  > [Deribit API docs](https://docs.deribit.com/#rate-limits)
+  """
+  matching_engine: TokenBucket = field(default_factory=matching_engine_bucket)
+  non_matching_engine: TokenBucket = field(default_factory=non_matching_engine_bucket)
+  max_retries: int = 5
+  backoff: timedelta = timedelta(milliseconds=50)
+  max_backoff: timedelta = timedelta(seconds=2)
+
+  registry: ClassVar[dict[str, 'RateLimiter']] = {}
+
+  @classmethod
+  def shared(cls, key: str) -> 'RateLimiter':
+    if (limiter := cls.registry.get(key)) is None:
+      limiter = cls.registry[key] = cls()
+    return limiter
+
+  def bucket(self, path: str) -> TokenBucket:
+    return self.matching_engine if path in MATCHING_ENGINE_METHODS else self.non_matching_engine
+
+  def backoff_delay(self, attempt: int) -> float:
+    # full jitter, so that retries don't happen in lockstep
+    cap = min(self.max_backoff.total_seconds(), self.backoff.total_seconds() * 2**attempt)
+    return random.uniform(0, cap)
+
+  async def run(self, path: str, request: Callable[[], Awaitable]):
+    bucket = self.bucket(path)
+    attempt = 0
+    while True:
+      await bucket.acquire()
+      r = await request()
+      if 'error' in r and r['error']['code'] == TOO_MANY_REQUESTS and attempt < self.max_retries:
+        bucket.drain()
+        delay = self.backoff_delay(attempt)
+        logger.debug('Rate limited on %s. Retrying in %.3f seconds', path, delay)
+        await asyncio.sleep(delay)
+        attempt += 1
+      else:
+        return r
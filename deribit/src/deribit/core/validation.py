@@ -11,6 +11,7 @@ class validator(Generic[T]):
     is_record = is_dataclass(Type) or is_typeddict(Type)
     if is_record and not hasattr(Type, '__pydantic_config__'):
       setattr(Type, '__pydantic_config__', ConfigDict(extra='allow'))
+    self.Type = Type
     self.adapter = TypeAdapter(Type)
     
   def json(self, data: str | bytes | bytearray) -> T:
@@ -27,6 +28,10 @@ class validator(Generic[T]):
     except PydanticValidationError as e:
       raise ValidationError from e
     
+  def __reduce__(self) -> tuple[Any, ...]:
+    # rebuild the (unpicklable) adapter from the type, e.g. in a worker process
+    return validator, (self.Type,)
+
   def __call__(self, data) -> T:
     if isinstance(data, str | bytes | bytearray):
       return self.json(data)
@@ -1,9 +1,18 @@
 from .client import SocketClient, SocketMixin
 from .auth import AuthedSocketClient, AuthedSocketMixin
+from .pool import SocketPool
+from .latency import LatencyStats
+from .subscriber import Consumer, Subscriber, LatestSubscriber, Backpressure
 
 __all__ = [
   'SocketClient',
   'SocketMixin',
   'AuthedSocketClient',
   'AuthedSocketMixin',
+  'SocketPool',
+  'LatencyStats',
+  'Consumer',
+  'Subscriber',
+  'LatestSubscriber',
+  'Backpressure',
 ]
\ No newline at end of file
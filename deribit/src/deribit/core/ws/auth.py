@@ -1,13 +1,15 @@
-from typing_extensions import TypedDict, AsyncIterable
+from typing_extensions import TypedDict
 from dataclasses import dataclass, field
+from datetime import timedelta
 import asyncio
 from uuid import uuid4
 import hmac
 import hashlib
 
 from deribit.core import timestamp, AuthedClient, AuthedClientMixin, ApiResponse, validator, AuthError, DERIBIT_MAINNET, DERIBIT_TESTNET
-from .client import SocketClient, SocketMixin, SubscribeResponse, validate_subscribe_response
+from .client import SocketClient, SocketMixin, SubscribeResponse, validate_channels
 from .base import Context, logger
+from .subscriber import Subscriber, Backpressure
 
 def sign(data: bytes, *, secret: str):
   return hmac.new(secret.encode(), data, hashlib.sha256).hexdigest()
@@ -33,6 +35,8 @@ validate_auth_response = validator(AuthResponseT)
 class AuthedSocketClient(SocketClient, AuthedClient):
   client_id: str
   client_secret: str = field(repr=False)
+  session_auth: bool = field(default=False, kw_only=True)
+  """Rely on the connection being authenticated (by `/public/auth`), instead of sending the access token with every private request."""
 
   @classmethod
   def new(cls, *, mainnet: bool = True, validate: bool = True):
@@ -63,11 +67,23 @@ class AuthedSocketClient(SocketClient, AuthedClient):
       'timestamp': ts,
       'nonce': nonce,
       'client_id': self.client_id,
-    })
+    }, result=validate_auth_response if self.validate else None)
+    if 'error' in r:
+      raise AuthError(r)
+    else:
+      resp: AuthData = r['result']
+      return resp
+
+  async def refresh(self, refresh_token: str):
+    """Renew the access token (and the connection's authentication) using the `refresh_token` grant."""
+    r = await self.request('/public/auth', {
+      'grant_type': 'refresh_token',
+      'refresh_token': refresh_token,
+    }, result=validate_auth_response if self.validate else None)
     if 'error' in r:
       raise AuthError(r)
     else:
-      resp: AuthData = validate_auth_response(r['result']) if self.validate else r['result']
+      resp: AuthData = r['result']
       return resp
 
   async def open(self):
@@ -75,44 +91,72 @@ class AuthedSocketClient(SocketClient, AuthedClient):
     auth_data = await self.login()
     logger.info('Loging successful, token expires in %s seconds', auth_data['expires_in'])
 
-    async def refresher(auth_data: AuthData):
+    async def renew(refresh_token: str) -> AuthData:
+      try:
+        return await self.refresh(refresh_token)
+      except AuthError as e:
+        logger.warning('Failed to refresh the token (%s). Logging in again', e)
+        return await self.login()
+
+    async def refresher():
       while True:
-        await asyncio.sleep(auth_data['expires_in'] - 60)
+        # re-read the context: reconnecting replaces the auth data
+        await asyncio.sleep(self._ctx.auth_data['expires_in'] - 60)
         logger.info('Refreshing token')
-        self._ctx.auth_data = auth_data = await self.login()
+        delay = self.reconnect_delay.total_seconds()
+        while True:
+          try:
+            auth_data = await renew(self._ctx.auth_data['refresh_token'])
+            break
+          except Exception as e:
+            # e.g. timed out, or the connection dropped mid-refresh: keep trying until it's renewed
+            delay = min(2*delay, self.max_reconnect_delay.total_seconds())
+            logger.warning('Failed to renew the token (%s). Retrying in %.2f seconds', e, delay)
+            await asyncio.sleep(delay)
+        self._ctx.auth_data = auth_data
         logger.info('Token refreshed successfully. New token expires in %s seconds', auth_data['expires_in'])
 
     self._ctx = AuthContext(
       auth_data=auth_data,
-      refresher=asyncio.create_task(refresher(auth_data)),
+      refresher=asyncio.create_task(refresher()),
       ws=ctx.ws,
       listener=ctx.listener,
     )
     return self._ctx
+
+  async def close(self, ctx: Context, exc_type=None, exc_value=None, traceback=None):
+    if isinstance(ctx, AuthContext):
+      ctx.refresher.cancel()
+    await super().close(ctx, exc_type, exc_value, traceback)
+  
+  async def on_reconnect(self):
+    # authenticate the new connection before restoring private subscriptions
+    ctx = await self.ctx
+    ctx.auth_data = await self.login()
+    logger.info('Re-authenticated after reconnect, token expires in %s seconds', ctx.auth_data['expires_in'])
+    await super().on_reconnect()
   
-  async def authed_request(self, path: str, params=None) -> ApiResponse:
+  async def authed_request(
+    self, path: str, params=None, *,
+    result: validator | None = None, timeout: timedelta | None = None,
+  ) -> ApiResponse:
     ctx = await self.ctx
-    r = await self.req({
-      'jsonrpc': '2.0',
+    if self.session_auth:
+      return await self.request(path, params, result=result, timeout=timeout)
+    return await self.limiter.run(path, lambda: self.req({
       'method': path,
       'params': params,
       'access_token': ctx.auth_data['access_token'],
-    })
-    if 'error' in r and r['error']['code'] == 10028: # too many requests
-      await asyncio.sleep(0.2)
-      return await self.authed_request(path, params)
-    else:
-      return r
+    }, result, timeout=timeout))
   
-  async def req_subscription(self, channel: str) -> SubscribeResponse:
-    r = await self.request('/private/subscribe', {
-      'channels': [channel],
-    })
-    return validate_subscribe_response(r) if self.validate else r
+  async def req_subscription(self, *channels: str) -> SubscribeResponse:
+    return await self.request('/private/subscribe', {
+      'channels': list(channels),
+    }, result=validate_channels if self.validate else None)
   
-  async def req_unsubscription(self, channel: str):
+  async def req_unsubscription(self, *channels: str):
     return await self.request('/private/unsubscribe', {
-      'channels': [channel],
+      'channels': list(channels),
     })
 
 
@@ -120,5 +164,8 @@ class AuthedSocketClient(SocketClient, AuthedClient):
 class AuthedSocketMixin(SocketMixin, AuthedClientMixin):
   client: AuthedSocketClient
 
-  async def subscribe(self, channel: str) -> tuple[SubscribeResponse, AsyncIterable]:
-    return await self.client.subscribe(channel)
+  async def subscribe(
+    self, channel: str, parser: validator | None = None, *,
+    maxsize: int | None = None, policy: Backpressure | None = None,
+  ) -> tuple[SubscribeResponse, Subscriber]:
+    return await self.client.subscribe(channel, parser, maxsize=maxsize, policy=policy)
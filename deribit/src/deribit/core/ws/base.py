@@ -1,10 +1,11 @@
-from typing_extensions import Mapping, TypeVar, Generic
+from typing_extensions import Mapping, TypeVar, Generic, Awaitable, Callable
 from abc import ABC, abstractmethod
 import asyncio
 from functools import wraps
 from dataclasses import dataclass, field
 from datetime import timedelta
 import logging
+import time
 import websockets
 
 from deribit.core import NetworkError, DERIBIT_MAINNET, path_join
@@ -23,13 +24,26 @@ class BaseSocketClient(ABC):
   """Base socket client class, including:
   - Connection management
   - Keep alive (ping) loop
-  - Restart loop
+  - Restart loop (reconnects with exponential backoff, see `reconnect_delay` and `max_reconnect_delay`)
+  - Stale connection detection (reconnects after `stale_after` without messages, if set)
   - Message handling loop
   """
   domain: str = DERIBIT_MAINNET
   path: str = '/ws/api/v2'
   timeout: timedelta = timedelta(seconds=10)
+  decode: bool = False
+  """Whether to decode text frames into `str`. By default, frames are handled as raw UTF-8 `bytes`, which the JSON decoders parse directly."""
+  reconnect: bool = True
+  reconnect_delay: timedelta = timedelta(milliseconds=50)
+  max_reconnect_delay: timedelta = timedelta(seconds=5)
+  stale_after: timedelta | None = None
+  """Declare the connection dead (and reconnect) after this long without receiving any message."""
   started: asyncio.Event = field(default_factory=asyncio.Event, init=False, repr=False)
+  restorer: asyncio.Task | None = field(default=None, init=False, repr=False)
+  watchdog: asyncio.Task | None = field(default=None, init=False, repr=False)
+  last_msg: float = field(default=0., init=False, repr=False)
+  disconnect_handlers: list[Callable[['BaseSocketClient', Exception], None]] = field(default_factory=list, init=False, repr=False)
+  """Callbacks run (synchronously) as soon as the connection drops, e.g. by a pool owning this client."""
 
   @property
   def url(self) -> str:
@@ -43,7 +57,14 @@ class BaseSocketClient(ABC):
   
   @property
   async def ws(self) -> websockets.ClientConnection:
-    return (await self.ctx).ws
+    ctx = await self.ctx
+    if not self.started.is_set():
+      # reconnecting: wait for the new connection instead of writing to the dead one
+      try:
+        await asyncio.wait_for(self.started.wait(), self.timeout.total_seconds())
+      except asyncio.TimeoutError as e:
+        raise NetworkError(f'Not connected to {self.url}') from e
+    return ctx.ws
   
   @staticmethod
   def with_client(fn):
@@ -64,37 +85,130 @@ class BaseSocketClient(ABC):
   async def __aexit__(self, exc_type, exc_value, traceback):
     await self.close(await self.ctx, exc_type, exc_value, traceback)
   
+  async def connect(self) -> websockets.ClientConnection:
+    try:
+      return await websockets.connect(self.url, open_timeout=self.timeout.total_seconds())
+    except (websockets.exceptions.WebSocketException, OSError, asyncio.TimeoutError) as e:
+      raise NetworkError(f'Failed to connect to {self.url}') from e
+
   async def open(self):
     logger.info('Opening...')
-    async def connect():
-      try:
-        return await websockets.connect(self.url, open_timeout=self.timeout.total_seconds())
-      except websockets.exceptions.WebSocketException as e:
-        raise NetworkError(f'Failed to connect to {self.url}') from e
-    
-    ws = await connect()
+    ws = await self.connect()
     logger.info('Connected!')
+    self.last_msg = time.monotonic()
     self._ctx = Context(
       ws=ws,
-      listener=asyncio.create_task(self.listener(ws)),
+      listener=asyncio.create_task(self.supervisor(ws)),
     )
+    if self.stale_after is not None:
+      self.watchdog = asyncio.create_task(self.watch(self.stale_after))
     self.started.set()
     return self._ctx
 
   async def close(self, ctx: Context, exc_type=None, exc_value=None, traceback=None):
     ctx.listener.cancel()
+    for task in (self.restorer, self.watchdog):
+      if task is not None:
+        task.cancel()
+    self.restorer = self.watchdog = None
     await ctx.ws.__aexit__(exc_type, exc_value, traceback)
+    self.started.clear()
     self._ctx = None
 
+  async def reconnect_loop(self) -> websockets.ClientConnection:
+    """Reconnect with exponential backoff. The first attempt is immediate."""
+    delay = 0.
+    attempt = 1
+    while True:
+      await asyncio.sleep(delay)
+      try:
+        return await self.connect()
+      except NetworkError as e:
+        delay = min(max(2*delay, self.reconnect_delay.total_seconds()), self.max_reconnect_delay.total_seconds())
+        logger.warning('Reconnect attempt %d failed (%s). Retrying in %.2f seconds', attempt, e.__cause__, delay)
+        attempt += 1
+
+  async def supervisor(self, ws: websockets.ClientConnection, /):
+    """Runs the listener, reconnecting and restoring the session whenever the connection drops."""
+    while True:
+      try:
+        await self.listener(ws)
+      except (websockets.exceptions.ConnectionClosed, NetworkError) as e:
+        logger.warning('Connection lost: %s', e)
+        # a failed send may leave the connection open: don't leave it behind
+        ws.transport.abort()
+        self.started.clear()
+        self.on_disconnect(NetworkError('Connection lost'))
+        if not self.reconnect:
+          exc = NetworkError('Connection lost')
+          # nothing will arrive anymore: end the subscriptions instead of leaving their consumers hanging
+          self.on_close(exc)
+          raise exc from e
+      
+      ws = await self.reconnect_loop()
+      logger.info('Reconnected!')
+      if (ctx := self._ctx) is None: # closed while reconnecting
+        await ws.close()
+        return
+      self.last_msg = time.monotonic()
+      ctx.ws = ws
+      self.started.set()
+      self.restorer = asyncio.create_task(self.restore(ws))
+
+  async def restore(self, ws: websockets.ClientConnection, /):
+    try:
+      await self.on_reconnect()
+    except asyncio.CancelledError:
+      raise
+    except Exception:
+      logger.exception('Failed to restore the session. Forcing a new reconnect')
+      await ws.close()
+
+  def silence(self) -> timedelta:
+    """Time since the last message was received."""
+    return timedelta(seconds=time.monotonic() - self.last_msg)
+
+  async def watch(self, stale_after: timedelta):
+    """Abort the connection if no message arrives within `stale_after`, so that the supervisor reconnects."""
+    while True:
+      await asyncio.sleep(stale_after.total_seconds() / 4)
+      if self.started.is_set() and (silence := self.silence()) > stale_after:
+        logger.warning('No messages received for %.1f seconds. Dropping the connection', silence.total_seconds())
+        self.abort()
+
+  def abort(self):
+    """Drop the connection, so that the supervisor reconnects. Doesn't wait for a closing handshake, since the connection may be half-open."""
+    self.started.clear()
+    if (ctx := self._ctx) is not None:
+      ctx.ws.transport.abort()
+
   async def listener(self, ws: websockets.ClientConnection, /):
     while True:
-      msg = await ws.recv()
+      msg = await ws.recv(decode=self.decode)
+      self.last_msg = time.monotonic()
       logger.debug('Received: %s', msg)
-      self.on_msg(msg)
+      try:
+        pending = self.on_msg(msg)
+      except Exception:
+        logger.exception('Error handling message: %s', msg)
+      else:
+        if pending is not None: # backpressure: stop reading until it's handled
+          await pending
 
   @abstractmethod
-  def on_msg(self, msg: str | bytes):
-    ...
+  def on_msg(self, msg: str | bytes) -> Awaitable | None:
+    """Handle an incoming message. May return an awaitable, for the listener to wait on before reading the next message."""
+
+  def on_disconnect(self, exc: Exception):
+    """Called as soon as the connection drops, before reconnecting."""
+    for handler in self.disconnect_handlers:
+      handler(self, exc)
+
+  def on_close(self, exc: Exception):
+    """Called when the connection drops for good (i.e. without `reconnect`)."""
+
+  async def on_reconnect(self):
+    """Called once a new connection is established, to restore the session (authentication, subscriptions...)."""
 
 class RpcSocketClient(BaseSocketClient, Generic[T]):
   """Base request/response socket client."""
@@ -0,0 +1,50 @@
+from typing_extensions import TypeVar, Generic, Callable, Awaitable, Sequence
+from dataclasses import dataclass, field
+from datetime import timedelta
+import asyncio
+
+T = TypeVar('T')
+
+def chunks(xs: Sequence[str], size: int) -> list[Sequence[str]]:
+  return [xs[i:i+size] for i in range(0, len(xs), size)]
+
+@dataclass
+class Batcher(Generic[T]):
+  """Coalesces calls made within the same event loop tick (or within `window`) into chunked bulk requests.
+
+  - `request`: sends a bulk request for the given keys.
+  - `split`: extracts the response for a single key out of the bulk response.
+  """
+  request: Callable[..., Awaitable[T]]
+  split: Callable[[T, str], T]
+  max_size: int = 100
+  window: timedelta = timedelta(0)
+  pending: dict[str, asyncio.Future[T]] = field(default_factory=dict, init=False, repr=False)
+  flusher: asyncio.Task | None = field(default=None, init=False, repr=False)
+
+  async def __call__(self, key: str) -> T:
+    if (fut := self.pending.get(key)) is None:
+      fut = self.pending[key] = asyncio.get_running_loop().create_future()
+      if self.flusher is None:
+        self.flusher = asyncio.create_task(self.flush())
+    # a cancelled caller must not cancel the reply shared with the rest of the batch
+    return await asyncio.shield(fut)
+
+  async def flush(self):
+    await asyncio.sleep(self.window.total_seconds())
+    pending, self.pending = self.pending, {}
+    self.flusher = None
+    keys = list(pending)
+    await asyncio.gather(*(self.send(chunk, pending) for chunk in chunks(keys, self.max_size)))
+
+  async def send(self, keys: Sequence[str], pending: dict[str, asyncio.Future[T]]):
+    try:
+      r = await self.request(*keys)
+    except Exception as e:
+      for key in keys:
+        if not pending[key].done():
+          pending[key].set_exception(e)
+    else:
+      for key in keys:
+        if not pending[key].done():
+          pending[key].set_result(self.split(r, key))
@@ -1,17 +1,24 @@
-from typing_extensions import TypedDict, Mapping, Any, TypeVar, Generic, NotRequired, Literal, AsyncIterable
-from dataclasses import dataclass
-import json
+from typing_extensions import TypedDict, Mapping, Any, TypeVar, Generic, NotRequired, Literal, Awaitable
+from dataclasses import dataclass, field
+from datetime import timedelta
+from functools import cache, partial
+from concurrent.futures import Executor
 import asyncio
+import re
+import json
 import websockets
 
 from deribit.core import (
   Client, ClientMixin, validator,
   DERIBIT_MAINNET, DERIBIT_TESTNET,
-  NetworkError,
-  OkResponse as BaseOkResponse,
+  NetworkError, ValidationError,
   ErrorResponse as BaseErrorResponse,
 )
-from .multiplex_streams_rpc import MultiplexStreamsRPCSocketClient, Message
+from deribit.core.jsonlib import Backend, json_backend
+from .base import logger
+from .multiplex_streams_rpc import MultiplexStreamsRPCSocketClient
+from .offload import OffloadDecoder
+from .subscriber import Subscriber, LatestSubscriber, Backpressure
 
 T = TypeVar('T', default=Any)
 
@@ -25,8 +32,8 @@ class BaseResponse(BaseMessage):
   usOut: int
   usDiff: int
 
-class OkResponse(BaseResponse, BaseOkResponse[T], Generic[T]):
-  ...
+class OkResponse(BaseResponse, Generic[T]):
+  result: T
 
 class ErrorResponse(BaseResponse, BaseErrorResponse):
   ...
@@ -36,14 +43,22 @@ ApiResponse = OkResponse[T] | ErrorResponse
 ApiResponseT: type[ApiResponse] = ApiResponse # type: ignore
 validate_response = validator(ApiResponseT)
 
-class MessageParams(TypedDict):
+@cache
+def response_validator(Result) -> validator[ApiResponse]:
+  return validator(OkResponse[Result] | ErrorResponse) # type: ignore
+
+class MessageParams(TypedDict, Generic[T]):
   channel: str
   label: NotRequired[str|None]
-  data: Any
+  data: T
 
-class ApiNotification(BaseMessage):
+class ApiNotification(BaseMessage, Generic[T]):
   method: Literal['subscription']
-  params: MessageParams
+  params: MessageParams[T]
+
+@cache
+def notification_validator(Data) -> validator[ApiNotification]:
+  return validator(ApiNotification[Data]) # type: ignore
 
 ApiMessage = ApiNotification | ApiResponse[T]
 
@@ -53,9 +68,49 @@ validate_message = validator(ApiMessageT)
 SubscribeResponse = ApiResponse[list[str]]
 SubscribeResponseT: type[SubscribeResponse] = SubscribeResponse # type: ignore
 validate_subscribe_response = validator(SubscribeResponseT)
+validate_channels = validator(list[str])
+
+RESPONSE_PREFIX = re.compile(rb'\{\s*"jsonrpc"\s*:\s*"2\.0"\s*,\s*"id"\s*:\s*(\d+)')
+"""Deribit sends the response ID right after the `jsonrpc` field. Peeking at it lets us pick the response's validator before decoding it."""
+NOTIFICATION_PREFIX = re.compile(rb'\{\s*"jsonrpc"\s*:\s*"2\.0"\s*,\s*"method"\s*:\s*"subscription"\s*,\s*"params"\s*:\s*\{\s*"channel"\s*:\s*"([^"]+)"')
+"""Likewise, notifications start with their channel, so we can route them (or drop them) before decoding."""
+
+def decode_notifications(backend: Backend, batch: list[tuple[str, validator | None, bytes]]) -> list[tuple[str, Any, str | None]]:
+  """Decode a batch of `(channel, parser, frame)` notifications (`parser` being the channel's, if any), e.g. in a worker thread or process."""
+  codec = json_backend(backend)
+  out = []
+  for channel, parser, frame in batch:
+    try:
+      if parser is not None:
+        out.append((channel, notification_validator(parser.Type)(frame)['params']['data'], None))
+      else:
+        out.append((channel, codec.loads(frame)['params']['data'], None))
+    except Exception as e:
+      # exceptions (e.g. pydantic's) may not survive the trip back from a process
+      out.append((channel, None, str(e)))
+  return out
+
+@cache
+def envelope_prefix(method: str) -> bytes:
+  """Pre-built start of a request to `method`, so that only the params (and the ID) are encoded per request."""
+  return b'{"jsonrpc":"2.0","method":' + json.dumps(method).encode() + b',"params":'
 
 @dataclass
 class SocketClient(MultiplexStreamsRPCSocketClient[ApiResponse, Any], Client):
+  heartbeat: timedelta | None = field(default=None, kw_only=True)
+  """Ask the server to check the connection every `heartbeat` (at least 10 seconds). Unless `stale_after` is set, the connection is declared dead after `2*heartbeat` without messages."""
+
+  executor: Executor | None = field(default=None, kw_only=True)
+  """If given, notifications are decoded in this executor (e.g. a `ThreadPoolExecutor(1)`, or a `ProcessPoolExecutor` to also sidestep the GIL, at the cost of pickling the frames, parsers and decoded notifications) instead of the event loop."""
+  decoder: OffloadDecoder | None = field(default=None, init=False, repr=False)
+  pending_sends: set[asyncio.Task] = field(default_factory=set, init=False, repr=False)
+
+  def __post_init__(self):
+    super().__post_init__()
+    if self.heartbeat is not None and self.stale_after is None:
+      self.stale_after = 2*self.heartbeat
+    if self.executor is not None:
+      self.decoder = OffloadDecoder(self.executor, partial(decode_notifications, self.json.name), self.publish)
 
   @classmethod
   def new(cls, *, mainnet: bool = True, validate: bool = True):
@@ -64,62 +119,157 @@ class SocketClient(MultiplexStreamsRPCSocketClient[ApiResponse, Any], Client):
       validate=validate,
     )
   
-  async def req_subscription(self, channel: str) -> SubscribeResponse:
-    r = await self.request('/public/subscribe', {
-      'channels': [channel],
-    })
-    return validate_subscribe_response(r) if self.validate else r
+  async def open(self):
+    ctx = await super().open()
+    if self.heartbeat is not None:
+      await self.set_heartbeat(self.heartbeat)
+    return ctx
+
+  async def on_reconnect(self):
+    if self.heartbeat is not None:
+      await self.set_heartbeat(self.heartbeat)
+    await super().on_reconnect()
+
+  async def set_heartbeat(self, interval: timedelta):
+    """Enable the server's heartbeats on the current connection.
+    
+    > [Deribit API docs](https://docs.deribit.com/#public-set_heartbeat)
+    """
+    r = await self.request('/public/set_heartbeat', {'interval': int(interval.total_seconds())})
+    if 'error' in r:
+      raise NetworkError(f'Failed to set heartbeat: {r["error"]}')
+  
+  def answer_heartbeat(self):
+    """Answer a heartbeat's test request (or the server closes the connection), in the background: the listener must keep reading meanwhile."""
+    id = self.counter
+    self.counter += 1
+    task = asyncio.create_task(self.send(id, {'method': '/public/test', 'params': {}}))
+    self.pending_sends.add(task)
+    task.add_done_callback(self.on_heartbeat_sent)
+
+  def on_heartbeat_sent(self, task: asyncio.Task):
+    self.pending_sends.discard(task)
+    if not task.cancelled() and (exc := task.exception()) is not None:
+      # the server will drop us anyway: reconnect right away
+      logger.warning('Failed to answer a heartbeat (%s). Dropping the connection', exc)
+      self.abort()
+
+  async def close(self, ctx, exc_type=None, exc_value=None, traceback=None):
+    if self.decoder is not None:
+      self.decoder.close()
+    for task in self.pending_sends:
+      task.cancel()
+    await super().close(ctx, exc_type, exc_value, traceback)
+
+  async def req_subscription(self, *channels: str) -> SubscribeResponse:
+    return await self.request('/public/subscribe', {
+      'channels': list(channels),
+    }, result=validate_channels if self.validate else None)
 
   
-  async def req_unsubscription(self, channel: str):
+  async def req_unsubscription(self, *channels: str):
     return await self.request('/public/unsubscribe', {
-      'channels': [channel],
+      'channels': list(channels),
     })
   
+  def split_subscription(self, r: SubscribeResponse, channel: str) -> SubscribeResponse:
+    if 'result' in r:
+      return {**r, 'result': [c for c in r['result'] if c == channel]}
+    else:
+      return r
+  
+  def encode(self, id: int, msg: Mapping) -> bytes:
+    if msg.keys() == {'method', 'params'}:
+      params = self.json.dumps(msg['params'])
+      if isinstance(params, str):
+        params = params.encode()
+      return b'%s%s,"id":%d}' % (envelope_prefix(msg['method']), params, id)
+    else:
+      data = self.json.dumps({'jsonrpc': '2.0', 'id': id, **msg})
+      return data.encode() if isinstance(data, str) else data
+
   async def send(self, id: int, msg: Mapping):
-    data = {
-      'jsonrpc': '2.0',
-      'id': id,
-      **msg,
-    }
+    data = self.encode(id, msg)
     ws = await self.ws
+    if (reply := self.replies.get(id)) is not None and reply.done():
+      # failed (or abandoned) while waiting for the connection: it must not reach the exchange
+      raise NetworkError(f'Request {id} was abandoned before being sent')
     try:
-      await ws.send(json.dumps(data), text=True)
+      await ws.send(data, text=True)
     except websockets.exceptions.WebSocketException as e:
       raise NetworkError from e
   
-  def parse_msg(self, msg: str | bytes) -> Message[ApiResponse, Any]:
-    r: ApiMessage = validate_message(msg) if self.validate else json.loads(msg)
-    if 'error' in r or 'result' in r:
-      return {
-        'kind': 'response',
-        'id': r['id'],
-        'response': r
-      }
+  def parse_response(self, id: int, data: bytes) -> ApiResponse:
+    if (result := self.parsers.get(id)) is not None:
+      return response_validator(result.Type)(data)
+    else:
+      return validate_response(data) if self.validate else self.json.loads(data)
+  
+  def parse_notification(self, channel: str, data: bytes):
+    if (parser := self.channel_parsers.get(channel)) is not None:
+      return notification_validator(parser.Type)(data)['params']['data']
     else:
-      return {
-        'kind': 'subscription',
-        'channel': r['params']['channel'],
-        'data': r['params']['data'],
-      }
+      return self.json.loads(data)['params']['data']
 
+  def on_msg(self, msg: str | bytes) -> Awaitable | None:
+    data = msg.encode() if isinstance(msg, str) else msg
+    if (m := NOTIFICATION_PREFIX.match(data)) is not None:
+      channel = m.group(1).decode()
+      if channel in self.subscribers: # no consumer, no decoding
+        if self.decoder is not None:
+          parser = self.channel_parsers.get(channel)
+          return self.decoder.put((channel, parser, bytes(data)))
+        return self.publish(channel, self.parse_notification(channel, data))
+    
+    elif (m := RESPONSE_PREFIX.match(data)) is not None:
+      id = int(m.group(1))
+      try:
+        self.resolve(id, self.parse_response(id, data))
+      except ValidationError as e:
+        self.fail(id, e)
+    
+    else:
+      # unusual field order: decode generically, then parse the result/data
+      r: ApiMessage = self.json.loads(data)
+      if 'error' in r or 'result' in r:
+        try:
+          if 'result' in r and (result := self.parsers.get(r['id'])) is not None:
+            r['result'] = result(r['result'])
+          self.resolve(r['id'], validate_response.python(r) if self.validate else r)
+        except ValidationError as e:
+          self.fail(r['id'], e)
+      elif r.get('method') == 'subscription' and (channel := r['params']['channel']) in self.subscribers:
+        data = r['params']['data']
+        if (parser := self.channel_parsers.get(channel)) is not None:
+          data = parser(data)
+        return self.publish(channel, data)
+      elif r.get('method') == 'heartbeat' and r.get('params', {}).get('type') == 'test_request':
+        self.answer_heartbeat()
 
-  async def request(self, path: str, params=None, /) -> ApiResponse:
-    r = await self.req({
-      'jsonrpc': '2.0',
+  async def request(
+    self, path: str, params=None, /, *,
+    result: validator | None = None, timeout: timedelta | None = None,
+  ) -> ApiResponse:
+    return await self.limiter.run(path, lambda: self.req({
       'method': path,
       'params': params,
-    })
-    if 'error' in r and r['error']['code'] == 10028: # too many requests
-      await asyncio.sleep(0.2)
-      return await self.request(path, params)
-    else:
-      return r
+    }, result, timeout=timeout))
     
 
 @dataclass(frozen=True)
 class SocketMixin(ClientMixin):
   client: SocketClient
 
-  async def subscribe(self, channel: str) -> tuple[SubscribeResponse, AsyncIterable]:
-    return await self.client.subscribe(channel)
\ No newline at end of file
+  async def subscribe(
+    self, channel: str, parser: validator | None = None, *,
+    maxsize: int | None = None, policy: Backpressure | None = None,
+  ) -> tuple[SubscribeResponse, Subscriber]:
+    """Subscribe to `channel`. If given, notifications are decoded straight into `parser`'s type.
+    
+    - `maxsize`, `policy`: bound the subscription's queue, and choose what happens when it fills up (defaults to the client's `maxsize` and `backpressure`).
+    """
+    return await self.client.subscribe(channel, parser, maxsize=maxsize, policy=policy)
+
+  async def subscribe_latest(self, channel: str, parser: validator | None = None) -> tuple[SubscribeResponse, LatestSubscriber]:
+    """Subscribe to `channel`, keeping only its latest notification. Iterating the subscriber yields `(latest, skipped)` pairs."""
+    return await self.client.subscribe_latest(channel, parser)
\ No newline at end of file
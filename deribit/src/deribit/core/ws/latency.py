@@ -0,0 +1,50 @@
+from dataclasses import dataclass, field
+from collections import deque
+from datetime import timedelta
+
+@dataclass
+class LatencyStats:
+  """Round-trip times of a connection's requests, from sending the request to routing its response.
+
+  - `window`: number of recent samples kept for the percentiles.
+  - `count`: number of requests measured so far.
+  """
+  window: int = 1000
+  count: int = field(default=0, init=False)
+  total: float = field(default=0., init=False, repr=False)
+  worst: float = field(default=0., init=False, repr=False)
+  samples: deque[float] = field(init=False, repr=False)
+
+  def __post_init__(self):
+    self.samples = deque(maxlen=self.window)
+
+  def record(self, seconds: float):
+    self.count += 1
+    self.total += seconds
+    if seconds > self.worst:
+      self.worst = seconds
+    self.samples.append(seconds)
+
+  @property
+  def mean(self) -> timedelta:
+    return timedelta(seconds=self.total / self.count if self.count else 0)
+
+  @property
+  def max(self) -> timedelta:
+    return timedelta(seconds=self.worst)
+
+  def percentile(self, q: float) -> timedelta:
+    """Latency at quantile `q` (between 0 and 1) over the last `window` requests."""
+    if not self.samples:
+      return timedelta(0)
+    xs = sorted(self.samples)
+    return timedelta(seconds=xs[min(len(xs)-1, int(q * len(xs)))])
+
+  def summary(self) -> dict[str, timedelta | int]:
+    return {
+      'count': self.count,
+      'mean': self.mean,
+      'p50': self.percentile(.5),
+      'p99': self.percentile(.99),
+      'max': self.max,
+    }
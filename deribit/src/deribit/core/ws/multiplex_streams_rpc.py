@@ -1,75 +1,194 @@
-from typing_extensions import Any, TypedDict, Literal, Mapping, TypeVar, Generic, AsyncIterable
+from typing_extensions import Any, Mapping, TypeVar, Generic, Awaitable
 from abc import abstractmethod
 from dataclasses import dataclass, field
+from datetime import timedelta
 import asyncio
-from .base import RpcSocketClient
+import time
+from deribit.core import NetworkError, UserError
+from .base import RpcSocketClient, logger
+from .batcher import Batcher
+from .latency import LatencyStats
+from .subscriber import Consumer, Subscriber, LatestSubscriber, Backpressure
 
 T = TypeVar('T')
 U = TypeVar('U')
 
-class Response(TypedDict, Generic[T]):
-  kind: Literal['response']
-  id: int
-  response: T
-
-class Subscription(TypedDict, Generic[U]):
-  kind: Literal['subscription']
-  channel: str
-  data: U
-
-Message = Response[T] | Subscription[U]
+def parsed_type(parser) -> Any:
+  """Type a channel's notifications are decoded into (`None` if undecoded)."""
+  return getattr(parser, 'Type', parser)
 
 @dataclass
 class MultiplexStreamsRPCSocketClient(RpcSocketClient[T], Generic[T, U]):
-  """Multiplexed request/response and streams socket client. It uses IDs to identify requests and responses. It also supports subscription to multiple channels."""
+  """Multiplexed request/response and streams socket client. It uses IDs to identify requests and responses. It also supports subscription to multiple channels.
+
+  Implementations route incoming messages in `on_msg` by calling `resolve`/`fail` (responses) and `publish` (notifications). Parsers can be registered per request ID (`parsers`) and per channel (`channel_parsers`), so that each message is decoded once, straight into its final type.
+  
+  Subscriptions (and unsubscriptions) made within the same event loop tick (or within `batch_window`) are sent together, in requests of up to `batch_size` channels.
+
+  Each subscription queues its notifications in a `Subscriber`, bounded to `maxsize` messages (unbounded by default) and handling overflows according to `backpressure`. Both can be overriden per subscription.
+
+  A channel can have multiple consumers, each with its own subscriber: they share a single server-side subscription, which is only cancelled once the last one unsubscribes. Notifications are decoded once and broadcast to all of them (as the same object: consumers must not mutate them), so they must all decode the channel the same way: attaching with a different parser raises `UserError`.
+
+  Round-trip times of the requests are tracked in `latency`.
+  """
+  batch_size: int = field(default=100, kw_only=True)
+  batch_window: timedelta = field(default=timedelta(0), kw_only=True)
+  maxsize: int | None = field(default=None, kw_only=True)
+  backpressure: Backpressure = field(default='block', kw_only=True)
   replies: dict[int, asyncio.Future[T]] = field(default_factory=dict, init=False, repr=False)
+  parsers: dict[int, Any] = field(default_factory=dict, init=False, repr=False)
+  sent: set[int] = field(default_factory=set, init=False, repr=False)
+  """IDs of the pending requests already written to the connection."""
   counter: int = field(default=0, init=False, repr=False)
-  subscribers: dict[str, asyncio.Queue[U]] = field(default_factory=dict, init=False, repr=False)
+  subscribers: dict[str, list[Consumer[U]]] = field(default_factory=dict, init=False, repr=False)
+  subscribed: dict[str, asyncio.Future[T]] = field(default_factory=dict, init=False, repr=False)
+  channel_parsers: dict[str, Any] = field(default_factory=dict, init=False, repr=False)
+  subscriptions: Batcher[T] = field(init=False, repr=False)
+  unsubscriptions: Batcher[T] = field(init=False, repr=False)
+  latency: LatencyStats = field(default_factory=LatencyStats, init=False, repr=False)
 
-  async def req(self, msg: Mapping) -> T:
+  def __post_init__(self):
+    self.subscriptions = Batcher(self.req_subscription, self.split_subscription, max_size=self.batch_size, window=self.batch_window)
+    self.unsubscriptions = Batcher(self.req_unsubscription, self.split_subscription, max_size=self.batch_size, window=self.batch_window)
+
+  async def req(self, msg: Mapping, parser: Any = None, *, timeout: timedelta | None = None) -> T:
+    """Send a request and wait for its response, for up to `timeout` (defaults to the client's `timeout`).
+    
+    If given, `parser` is registered under the request ID, so that `on_msg` can decode the response with it.
+    """
     id = self.counter
     self.counter += 1
-    while True:
-      self.replies[id] = asyncio.Future()
+    reply = self.replies[id] = asyncio.get_running_loop().create_future()
+    if parser is not None:
+      self.parsers[id] = parser
+    try:
+      start = time.perf_counter()
       await self.send(id, msg)
-      res = await self.replies[id]
-      del self.replies[id]
-      return res
+      self.sent.add(id)
+      r = await asyncio.wait_for(reply, (timeout or self.timeout).total_seconds())
+      self.latency.record(time.perf_counter() - start)
+      return r
+    except asyncio.TimeoutError as e:
+      raise NetworkError(f'Request {id} timed out') from e
+    finally:
+      self.replies.pop(id, None)
+      self.parsers.pop(id, None)
+      self.sent.discard(id)
     
   @abstractmethod
-  async def req_subscription(self, channel: str) -> T:
+  async def req_subscription(self, *channels: str) -> T:
     ...
 
   @abstractmethod
-  async def req_unsubscription(self, channel: str) -> T:
+  async def req_unsubscription(self, *channels: str) -> T:
     ...
 
   @abstractmethod
-  def parse_msg(self, msg: str | bytes) -> Message[T, U]:
-    ...
+  def split_subscription(self, r: T, channel: str) -> T:
+    """Extract the response for `channel` out of a (un)subscription response for multiple channels."""
+
+  def resolve(self, id: int, response: T):
+    # the requester may have timed out or been cancelled already
+    if (reply := self.replies.get(id)) is not None and not reply.done():
+      reply.set_result(response)
+    else:
+      logger.debug('Ignoring response to unknown or abandoned request %d', id)
 
-  def on_msg(self, msg: str | bytes):
-    res = self.parse_msg(msg)
-    if res['kind'] == 'response':
-      self.replies[res['id']].set_result(res['response'])
+  def fail(self, id: int, exc: Exception):
+    """Raise `exc` to the requester of `id` (e.g. if its response couldn't be parsed)."""
+    if (reply := self.replies.get(id)) is not None and not reply.done():
+      reply.set_exception(exc)
     else:
-      self.subscribers[res['channel']].put_nowait(res['data'])
+      logger.debug('Ignoring failed response to unknown or abandoned request %d', id)
+
+  def publish(self, channel: str, data: U) -> Awaitable | None:
+    """Queue `data` for the subscribers of `channel`. Returns an awaitable if the listener must wait for them to consume it."""
+    if (subscribers := self.subscribers.get(channel)) is not None:
+      if len(subscribers) == 1:
+        return subscribers[0].put(data)
+      pending = [p for subscriber in subscribers if (p := subscriber.put(data)) is not None]
+      if pending:
+        return asyncio.gather(*pending)
+
+  def on_disconnect(self, exc: Exception):
+    super().on_disconnect(exc)
+    # replies to the requests written to the lost connection will never arrive: fail them right away.
+    # requests not written yet are still waiting for the new connection, and will be sent through it
+    for id in self.sent:
+      if (reply := self.replies.pop(id, None)) is not None and not reply.done():
+        reply.set_exception(exc)
+      self.parsers.pop(id, None)
+    self.sent.clear()
+
+  def on_close(self, exc: Exception):
+    super().on_close(exc)
+    for subscribers in self.subscribers.values():
+      for subscriber in subscribers:
+        subscriber.close(exc)
+
+  async def on_reconnect(self):
+    await super().on_reconnect()
+    if self.subscribers:
+      channels = list(self.subscribers)
+      logger.info('Resubscribing to %d channels', len(channels))
+      await asyncio.gather(*(self.subscriptions(channel) for channel in channels))
 
   @abstractmethod
   async def send(self, id: int, msg: Mapping):
     ...
 
-  async def subscribe(self, channel: str) -> tuple[T, AsyncIterable[U]]:
-    self.subscribers[channel] = asyncio.Queue()
-    r = await self.req_subscription(channel)
-    async def gen():
-      while True:
-        if (queue := self.subscribers.get(channel)) is None:
-          return # unsubscribed
-        val = await queue.get()
-        yield val
-    return r, gen()
-
-  async def unsubscribe(self, channel: str):
-    del self.subscribers[channel]
-    await self.req_unsubscription(channel)
+  async def subscribe(
+    self, channel: str, parser: Any = None, *,
+    maxsize: int | None = None, policy: Backpressure | None = None,
+  ) -> tuple[T, Subscriber[U]]:
+    """Subscribe to `channel`. If given, notifications are decoded with `parser`.
+    
+    - `maxsize`, `policy`: override the client's `maxsize` and `backpressure` for this subscription.
+    """
+    subscriber = Subscriber[U](
+      maxsize=maxsize if maxsize is not None else self.maxsize,
+      policy=policy or self.backpressure,
+    )
+    return await self.add_subscriber(channel, subscriber, parser), subscriber
+
+  async def subscribe_latest(self, channel: str, parser: Any = None) -> tuple[T, LatestSubscriber[U]]:
+    """Subscribe to `channel`, keeping only its latest notification. Iterating the subscriber yields `(latest, skipped)` pairs."""
+    subscriber = LatestSubscriber[U]()
+    return await self.add_subscriber(channel, subscriber, parser), subscriber
+
+  async def add_subscriber(self, channel: str, subscriber: Consumer[U], parser: Any = None) -> T:
+    return await self.attach(channel, [subscriber], parser)
+
+  async def attach(self, channel: str, subscribers: list[Consumer[U]], parser: Any = None) -> T:
+    """Add consumers to `channel`, subscribing to it unless it already is."""
+    if (consumers := self.subscribers.get(channel)) is not None:
+      if parsed_type(parser) != parsed_type(current := self.channel_parsers.get(channel)):
+        raise UserError(f'Channel {channel} is already decoded differently: its consumers must share the same parser (e.g. the same `numeric` and `validate`)')
+      consumers.extend(subscribers)
+    else:
+      self.subscribers[channel] = list(subscribers)
+      if parser is not None:
+        self.channel_parsers[channel] = parser
+    sub = self.subscribed.get(channel)
+    if sub is None or (sub.done() and (sub.cancelled() or sub.exception() is not None)):
+      sub = self.subscribed[channel] = asyncio.ensure_future(self.subscriptions(channel))
+    # a cancelled consumer must not cancel the subscription shared with the others
+    return await asyncio.shield(sub)
+
+  def detach(self, channel: str) -> tuple[list[Consumer[U]], Any]:
+    """Remove the subscribers of `channel` (and its parser) without closing them, e.g. to move them to another connection."""
+    self.subscribed.pop(channel, None)
+    return self.subscribers.pop(channel), self.channel_parsers.pop(channel, None)
+
+  async def unsubscribe(self, channel: str, subscriber: Consumer[U] | None = None):
+    """Remove `subscriber` from `channel` (or all of its subscribers, if not given). The channel is unsubscribed once it has no subscribers left."""
+    subscribers = self.subscribers[channel]
+    removed = subscribers[:] if subscriber is None else [subscriber]
+    for s in removed:
+      subscribers.remove(s)
+      s.close()
+    if not subscribers:
+      del self.subscribers[channel]
+      self.subscribed.pop(channel, None)
+      self.channel_parsers.pop(channel, None)
+      await self.unsubscriptions(channel)
@@ -0,0 +1,80 @@
+from typing_extensions import Any, Callable, Awaitable
+from dataclasses import dataclass, field
+from concurrent.futures import Executor
+from collections import deque
+import asyncio
+from .base import logger
+
+@dataclass(eq=False)
+class OffloadDecoder:
+  """Decodes messages in `executor` (a thread or process pool), so that heavy parsing doesn't block the event loop.
+
+  Messages received within the same event loop tick are decoded together, in batches of up to `batch_size`. Decoded batches are handed back to `publish` in the order they were received.
+
+  - `decode`: decodes a batch of messages into `(channel, data, error)` tuples. Must be picklable to run in a process pool.
+  - `max_inflight`: maximum number of batches being decoded. Beyond that, the listener waits.
+  """
+  executor: Executor
+  decode: Callable[[list], list[tuple[str, Any, str | None]]]
+  publish: Callable[[str, Any], Awaitable | None]
+  batch_size: int = 256
+  max_inflight: int = 8
+  batch: list = field(default_factory=list, init=False, repr=False)
+  inflight: deque[asyncio.Future] = field(default_factory=deque, init=False, repr=False)
+  ready: asyncio.Event = field(default_factory=asyncio.Event, init=False, repr=False)
+  space: asyncio.Event = field(default_factory=asyncio.Event, init=False, repr=False)
+  dispatcher: asyncio.Task | None = field(default=None, init=False, repr=False)
+
+  def put(self, item) -> Awaitable | None:
+    """Queue `item` for decoding. Returns an awaitable if the listener must wait for the decoder to catch up."""
+    self.batch.append(item)
+    if len(self.batch) == 1:
+      asyncio.get_running_loop().call_soon(self.submit)
+    elif len(self.batch) >= self.batch_size:
+      self.submit()
+    if len(self.inflight) >= self.max_inflight:
+      return self.wait_space()
+
+  def submit(self):
+    if not self.batch:
+      return
+    batch, self.batch = self.batch, []
+    loop = asyncio.get_running_loop()
+    self.inflight.append(loop.run_in_executor(self.executor, self.decode, batch))
+    self.ready.set()
+    if self.dispatcher is None:
+      self.dispatcher = asyncio.create_task(self.dispatch())
+
+  async def wait_space(self):
+    while len(self.inflight) >= self.max_inflight:
+      self.space.clear()
+      await self.space.wait()
+
+  async def dispatch(self):
+    while True:
+      while not self.inflight:
+        self.ready.clear()
+        await self.ready.wait()
+      fut = self.inflight[0]
+      try:
+        results = await fut
+      except Exception:
+        logger.exception('Failed to decode a batch of messages')
+        results = []
+      finally:
+        self.inflight.popleft()
+        self.space.set()
+      for channel, data, error in results:
+        if error is not None:
+          logger.error('Failed to decode message on %s: %s', channel, error)
+        elif (pending := self.publish(channel, data)) is not None:
+          await pending
+
+  def close(self):
+    if self.dispatcher is not None:
+      self.dispatcher.cancel()
+      self.dispatcher = None
+    for fut in self.inflight:
+      fut.cancel()
+    self.inflight.clear()
+    self.batch.clear()
@@ -0,0 +1,99 @@
+from typing_extensions import Any
+from dataclasses import dataclass, field
+import asyncio
+
+from deribit.core import validator, UserError, DERIBIT_MAINNET, DERIBIT_TESTNET
+from .base import BaseSocketClient, logger
+from .client import SocketClient, SubscribeResponse
+from .subscriber import Consumer, Subscriber, LatestSubscriber, Backpressure
+
+@dataclass
+class SocketPool:
+  """Spreads subscriptions across multiple connections, so that heavy channels (e.g. order books) don't all go through a single socket and listener.
+
+  Each channel is placed on the least loaded connection. When a connection drops, its channels are moved to the remaining ones (their subscribers keep working), and the connection gets new channels once it recovers.
+
+  - `shards`: the pooled clients.
+  """
+  shards: list[SocketClient]
+  placement: dict[str, SocketClient] = field(default_factory=dict, init=False, repr=False)
+  rebalancers: set[asyncio.Task] = field(default_factory=set, init=False, repr=False)
+
+  @classmethod
+  def new(cls, size: int = 4, *, mainnet: bool = True, validate: bool = True, **kwargs):
+    """Pool of `size` clients. Extra `kwargs` are passed to every `SocketClient`."""
+    domain = DERIBIT_MAINNET if mainnet else DERIBIT_TESTNET
+    return cls([SocketClient(domain=domain, validate=validate, **kwargs) for _ in range(size)])
+
+  def __post_init__(self):
+    for shard in self.shards:
+      shard.disconnect_handlers.append(self.on_disconnect)
+
+  async def __aenter__(self):
+    await asyncio.gather(*(shard.open() for shard in self.shards))
+    return self
+  
+  async def __aexit__(self, exc_type, exc_value, traceback):
+    for task in self.rebalancers:
+      task.cancel()
+    await asyncio.gather(*(
+      shard.close(ctx, exc_type, exc_value, traceback)
+      for shard in self.shards if (ctx := getattr(shard, '_ctx', None)) is not None
+    ))
+
+  def load(self) -> list[int]:
+    """Number of channels on each shard."""
+    return [len(shard.subscribers) for shard in self.shards]
+
+  def pick(self, exclude: SocketClient | None = None) -> SocketClient:
+    """Least loaded shard, preferring connected ones."""
+    shards = [s for s in self.shards if s is not exclude]
+    if not shards:
+      raise UserError('No shards available in the pool')
+    return min(shards, key=lambda s: (not s.started.is_set(), len(s.subscribers)))
+
+  def shard(self, channel: str) -> SocketClient:
+    if (shard := self.placement.get(channel)) is None:
+      shard = self.placement[channel] = self.pick()
+    return shard
+
+  async def subscribe(
+    self, channel: str, parser: validator | None = None, *,
+    maxsize: int | None = None, policy: Backpressure | None = None,
+  ) -> tuple[SubscribeResponse, Subscriber]:
+    """Subscribe to `channel` on the least loaded shard. See `SocketClient.subscribe`."""
+    return await self.shard(channel).subscribe(channel, parser, maxsize=maxsize, policy=policy)
+
+  async def subscribe_latest(self, channel: str, parser: validator | None = None) -> tuple[SubscribeResponse, LatestSubscriber]:
+    """Subscribe to `channel` on the least loaded shard, keeping only its latest notification. See `SocketClient.subscribe_latest`."""
+    return await self.shard(channel).subscribe_latest(channel, parser)
+
+  async def unsubscribe(self, channel: str, subscriber: Consumer | None = None):
+    """Remove `subscriber` from `channel` (or all of its subscribers). See `SocketClient.unsubscribe`."""
+    shard = self.placement[channel]
+    await shard.unsubscribe(channel, subscriber)
+    if channel not in shard.subscribers:
+      self.placement.pop(channel, None)
+
+  def on_disconnect(self, lost: BaseSocketClient, exc: Exception):
+    assert isinstance(lost, SocketClient)
+    healthy = [s for s in self.shards if s is not lost and s.started.is_set()]
+    if not healthy or not lost.subscribers:
+      # nowhere to go: the shard restores its own subscriptions once reconnected
+      return
+    # detach right away, so that the lost shard doesn't resubscribe when it reconnects
+    moved = {channel: lost.detach(channel) for channel in list(lost.subscribers)}
+    logger.info('Moving %d channels off a lost connection', len(moved))
+    task = asyncio.create_task(self.rebalance(lost, moved))
+    self.rebalancers.add(task)
+    task.add_done_callback(self.rebalancers.discard)
+
+  async def rebalance(self, lost: SocketClient, moved: dict[str, tuple[list[Consumer], Any]]):
+    async def move(channel: str, subscribers: list[Consumer], parser):
+      shard = self.placement[channel] = self.pick(exclude=lost)
+      try:
+        await shard.attach(channel, subscribers, parser)
+      except Exception:
+        logger.exception('Failed to move channel %s', channel)
+
+    await asyncio.gather(*(move(channel, subscribers, parser) for channel, (subscribers, parser) in moved.items()))
@@ -0,0 +1,203 @@
+from typing_extensions import TypeVar, Generic, Literal, AsyncIterator, Awaitable, Protocol
+from dataclasses import dataclass, field
+from datetime import timedelta
+from collections import deque
+import asyncio
+from .base import logger
+
+U = TypeVar('U')
+U_contra = TypeVar('U_contra', contravariant=True)
+
+Backpressure = Literal['block', 'drop_oldest', 'conflate']
+"""What to do when a subscriber's queue is full:
+- `block`: stop reading from the socket until the consumer catches up (logs a warning when it starts blocking, and once it catches up)
+- `drop_oldest`: discard the oldest queued message
+- `conflate`: discard every queued message, keeping only the latest
+"""
+
+class Consumer(Protocol[U_contra]):
+  """Receiver of a channel's notifications, as handed by the client (e.g. a `Subscriber`, or a sink applying them right away)."""
+  def put(self, item: U_contra, /) -> Awaitable | None:
+    """Take `item`. Returns an awaitable if the listener must wait before handing the next one."""
+    ...
+
+  def close(self, exc: Exception | None = None, /):
+    """No more notifications will come (because of `exc`, if given)."""
+    ...
+
+@dataclass(eq=False)
+class Subscriber(Generic[U]):
+  """Queue of notifications for a subscription consumer. Iterate it to consume the messages one by one, or iterate `batches()` to consume them in bulk.
+
+  - `maxsize`: maximum number of queued messages (`None` for unbounded).
+  - `policy`: what to do when the queue is full.
+  - `dropped`: number of messages discarded so far.
+  - `high_water`: maximum number of messages queued so far.
+  """
+  maxsize: int | None = None
+  policy: Backpressure = 'block'
+  dropped: int = field(default=0, init=False)
+  high_water: int = field(default=0, init=False)
+  closed: bool = field(default=False, init=False)
+  blocked: int = field(default=0, init=False, repr=False)
+  """Number of puts that blocked since the queue last had room (`0` if not blocking)."""
+  error: Exception | None = field(default=None, init=False, repr=False)
+  items: deque[U] = field(default_factory=deque, init=False, repr=False)
+  ready: asyncio.Event = field(default_factory=asyncio.Event, init=False, repr=False)
+  space: asyncio.Event = field(default_factory=asyncio.Event, init=False, repr=False)
+
+  def full(self) -> bool:
+    return self.maxsize is not None and len(self.items) >= self.maxsize
+
+  def put(self, item: U):
+    """Queue `item`. Returns an awaitable if the listener must wait for the consumer (`block` policy)."""
+    if self.full():
+      if self.policy == 'drop_oldest':
+        self.items.popleft()
+        self.dropped += 1
+      elif self.policy == 'conflate':
+        self.dropped += len(self.items)
+        self.items.clear()
+      else:
+        return self.put_blocking(item)
+    elif self.blocked:
+      logger.warning('Subscriber queue caught up, after blocking the listener on %d messages', self.blocked)
+      self.blocked = 0
+    self.push(item)
+
+  async def put_blocking(self, item: U):
+    if not self.blocked:
+      logger.warning('Subscriber queue is full (%d messages). Blocking the listener until it is consumed', len(self.items))
+    self.blocked += 1
+    while self.full() and not self.closed:
+      self.space.clear()
+      await self.space.wait()
+    self.push(item)
+
+  def push(self, item: U):
+    self.items.append(item)
+    if len(self.items) > self.high_water:
+      self.high_water = len(self.items)
+    self.ready.set()
+
+  def close(self, exc: Exception | None = None):
+    """Stop the iteration once the queued messages are consumed (raising `exc` to the consumer, if given)."""
+    self.closed = True
+    self.error = exc
+    self.ready.set()
+    self.space.set()
+
+  def stop(self):
+    if self.error is not None:
+      raise self.error
+    raise StopAsyncIteration
+
+  async def get(self) -> U:
+    while not self.items:
+      if self.closed:
+        self.stop()
+      self.ready.clear()
+      await self.ready.wait()
+    item = self.items.popleft()
+    self.space.set()
+    return item
+
+  def drain(self, max_size: int | None = None) -> list[U]:
+    """Take every queued message (up to `max_size`), without waiting."""
+    n = len(self.items) if max_size is None else min(max_size, len(self.items))
+    batch = [self.items.popleft() for _ in range(n)]
+    if batch:
+      self.space.set()
+    return batch
+
+  async def get_batch(self, max_size: int | None = None, max_wait: timedelta | None = None) -> list[U]:
+    """Wait for at least one message, then take every queued message (up to `max_size`).
+    
+    - `max_wait`: after the first message, keep waiting up to this long for the batch to fill up (to `max_size`, or to the queue's `maxsize`).
+    """
+    while not self.items:
+      if self.closed:
+        self.stop()
+      self.ready.clear()
+      await self.ready.wait()
+    if max_wait is not None:
+      loop = asyncio.get_running_loop()
+      deadline = loop.time() + max_wait.total_seconds()
+      limit = max_size or self.maxsize
+      while not self.closed and (limit is None or len(self.items) < limit) and (left := deadline - loop.time()) > 0:
+        self.ready.clear()
+        try:
+          await asyncio.wait_for(self.ready.wait(), left)
+        except asyncio.TimeoutError:
+          break
+    return self.drain(max_size)
+
+  async def batches(self, max_size: int | None = None, max_wait: timedelta | None = None) -> AsyncIterator[list[U]]:
+    """Iterate the messages in batches, paying a single wakeup per batch. See `get_batch`."""
+    while True:
+      try:
+        yield await self.get_batch(max_size, max_wait)
+      except StopAsyncIteration:
+        return
+
+  def __aiter__(self) -> AsyncIterator[U]:
+    return self
+
+  async def __anext__(self) -> U:
+    return await self.get()
+
+@dataclass(eq=False)
+class LatestSubscriber(Generic[U]):
+  """Conflating subscriber: holds only the latest notification, overwritten as new ones arrive.
+  
+  Iterating it yields `(latest, skipped)`, where `skipped` is the number of notifications overwritten since the previous read.
+
+  - `dropped`: total number of notifications overwritten so far.
+  """
+  dropped: int = field(default=0, init=False)
+  closed: bool = field(default=False, init=False)
+  error: Exception | None = field(default=None, init=False, repr=False)
+  skipped: int = field(default=0, init=False, repr=False)
+  filled: bool = field(default=False, init=False, repr=False)
+  slot: U | None = field(default=None, init=False, repr=False)
+  ready: asyncio.Event = field(default_factory=asyncio.Event, init=False, repr=False)
+
+  def put(self, item: U):
+    if self.filled:
+      self.skipped += 1
+      self.dropped += 1
+    self.slot = item
+    self.filled = True
+    self.ready.set()
+
+  def close(self, exc: Exception | None = None):
+    """Stop the iteration once the latest notification is consumed (raising `exc` to the consumer, if given)."""
+    self.closed = True
+    self.error = exc
+    self.ready.set()
+
+  def poll(self) -> tuple[U, int] | None:
+    """Take the latest notification (and the number skipped) if there's a new one, without waiting."""
+    if not self.filled:
+      return None
+    item, skipped = self.slot, self.skipped
+    self.slot = None
+    self.filled = False
+    self.skipped = 0
+    return item, skipped # type: ignore
+
+  async def get(self) -> tuple[U, int]:
+    while (r := self.poll()) is None:
+      if self.closed:
+        if self.error is not None:
+          raise self.error
+        raise StopAsyncIteration
+      self.ready.clear()
+      await self.ready.wait()
+    return r
+
+  def __aiter__(self) -> AsyncIterator[tuple[U, int]]:
+    return self
+
+  async def __anext__(self) -> tuple[U, int]:
+    return await self.get()
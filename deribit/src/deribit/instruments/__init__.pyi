@@ -0,0 +1,9 @@
+from .catalog import InstrumentCatalog
+from .chain import OptionChain, ExpiryChain, Strike
+from .pricing import ChainPricer, black76, greeks, implied_vol
+
+__all__ = [
+  'InstrumentCatalog',
+  'OptionChain', 'ExpiryChain', 'Strike',
+  'ChainPricer', 'black76', 'greeks', 'implied_vol',
+]
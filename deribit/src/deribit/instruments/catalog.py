@@ -0,0 +1,143 @@
+from dataclasses import dataclass, field
+from datetime import timedelta
+from decimal import Decimal
+import asyncio
+import logging
+import time
+
+from deribit.core import Client, ApiError, round2tick, trunc2tick
+from deribit.core.numeric import Ticks
+from deribit.market_data.get_instrument import Instrument, InstrumentKind
+from deribit.market_data.get_instruments import Currency
+
+logger = logging.getLogger('deribit.instruments')
+
+@dataclass(frozen=True)
+class Indexes:
+  by_name: dict[str, Instrument] = field(default_factory=dict)
+  by_id: dict[int, Instrument] = field(default_factory=dict)
+  by_pair: dict[tuple[str, str, str], list[Instrument]] = field(default_factory=dict)
+  by_expiry: dict[int, list[Instrument]] = field(default_factory=dict)
+
+  def add(self, instrument: Instrument):
+    self.by_name[instrument['instrument_name']] = instrument
+    self.by_id[instrument['instrument_id']] = instrument
+    pair = instrument['base_currency'], instrument['quote_currency'], instrument.get('kind', 'spot')
+    self.by_pair.setdefault(pair, []).append(instrument)
+    self.by_expiry.setdefault(instrument['expiration_timestamp'], []).append(instrument)
+
+@dataclass(eq=False)
+class InstrumentCatalog:
+  """Cache of the instruments (from a single `get_instruments` call), indexed by name, `instrument_id`, `(base, quote, kind)` and expiration timestamp.
+
+  Reloaded in the background every `ttl` (once `start`ed, or used as an async context manager). Lookups never hit the network, except `instrument(name)` for an instrument listed since the last load.
+
+  - `currency`, `kind`: restrict the catalog (all instruments by default).
+  """
+  client: Client
+  currency: Currency = 'any'
+  kind: InstrumentKind | None = None
+  ttl: timedelta = timedelta(minutes=10)
+  validate: bool = True
+  indexes: Indexes = field(default_factory=Indexes, init=False, repr=False)
+  loaded: float | None = field(default=None, init=False, repr=False)
+  refresher: asyncio.Task | None = field(default=None, init=False, repr=False)
+
+  async def __aenter__(self):
+    await self.start()
+    return self
+
+  async def __aexit__(self, exc_type, exc_value, traceback):
+    self.close()
+
+  async def start(self):
+    """Load the catalog, and keep reloading it every `ttl`."""
+    await self.load()
+    if self.refresher is None:
+      self.refresher = asyncio.create_task(self.refresh())
+
+  def close(self):
+    if self.refresher is not None:
+      self.refresher.cancel()
+      self.refresher = None
+
+  async def load(self):
+    from deribit import MarketData
+    r = await MarketData(self.client).get_instruments(self.currency, kind=self.kind, validate=self.validate)
+    if 'error' in r:
+      raise ApiError(r['error'])
+    indexes = Indexes()
+    for instrument in r['result']:
+      indexes.add(instrument)
+    # swap all the indexes at once, so lookups never see a partial catalog
+    self.indexes = indexes
+    self.loaded = time.monotonic()
+    logger.info('Loaded %d instruments', len(indexes.by_name))
+
+  async def refresh(self):
+    while True:
+      await asyncio.sleep(self.ttl.total_seconds())
+      try:
+        await self.load()
+      except Exception:
+        logger.exception('Failed to refresh the instruments. Keeping the previous ones')
+
+  @property
+  def stale(self) -> bool:
+    return self.loaded is None or time.monotonic() - self.loaded > self.ttl.total_seconds()
+
+  def __getitem__(self, instrument_name: str) -> Instrument:
+    return self.indexes.by_name[instrument_name]
+
+  def __contains__(self, instrument_name: str) -> bool:
+    return instrument_name in self.indexes.by_name
+
+  def __len__(self) -> int:
+    return len(self.indexes.by_name)
+
+  def get(self, instrument_name: str) -> Instrument | None:
+    return self.indexes.by_name.get(instrument_name)
+
+  def by_id(self, instrument_id: int) -> Instrument | None:
+    return self.indexes.by_id.get(instrument_id)
+
+  def find(self, base: str, quote: str, kind: InstrumentKind = 'spot') -> list[Instrument]:
+    """Instruments of a `base`/`quote` pair and `kind`."""
+    return self.indexes.by_pair.get((base, quote, kind), [])
+
+  def expiring(self, expiration_timestamp: int) -> list[Instrument]:
+    """Instruments expiring at `expiration_timestamp` (in milliseconds)."""
+    return self.indexes.by_expiry.get(expiration_timestamp, [])
+
+  def expiries(self) -> list[int]:
+    return sorted(self.indexes.by_expiry)
+
+  async def instrument(self, instrument_name: str) -> Instrument:
+    """Look up an instrument, fetching (and caching) it if it isn't in the catalog yet."""
+    if (instrument := self.get(instrument_name)) is not None:
+      return instrument
+    from deribit import MarketData
+    r = await MarketData(self.client).get_instrument(instrument_name, validate=self.validate)
+    if 'error' in r:
+      raise ApiError(r['error'])
+    self.indexes.add(r['result'])
+    return r['result']
+
+  def tick_size(self, instrument_name: str) -> Decimal:
+    return self[instrument_name]['tick_size']
+
+  def contract_size(self, instrument_name: str) -> Decimal:
+    return self[instrument_name]['contract_size']
+
+  def min_trade_amount(self, instrument_name: str) -> Decimal:
+    return self[instrument_name]['min_trade_amount']
+
+  def round_price(self, instrument_name: str, price: Decimal) -> Decimal:
+    return round2tick(price, self.tick_size(instrument_name))
+
+  def trunc_amount(self, instrument_name: str, amount: Decimal) -> Decimal:
+    return trunc2tick(amount, self.min_trade_amount(instrument_name))
+
+  def ticks(self, instrument_name: str) -> Ticks:
+    """Fixed-point scale of the instrument (see `Ticks`), with amounts in steps of its `min_trade_amount`."""
+    return Ticks(self.tick_size(instrument_name), self.min_trade_amount(instrument_name))
@@ -0,0 +1,161 @@
+from typing_extensions import Iterable, Iterator, NamedTuple
+from dataclasses import dataclass, field
+from decimal import Decimal
+from bisect import bisect_left, bisect_right
+
+from deribit.core import Client, ApiError
+from deribit.market_data.get_instrument import Option, OptionType
+from .catalog import InstrumentCatalog
+
+class Strike(NamedTuple):
+  strike: Decimal
+  call: str | None
+  put: str | None
+
+class Location(NamedTuple):
+  expiration_timestamp: int
+  strike_index: int
+  option_type: OptionType
+
+@dataclass(eq=False)
+class ExpiryChain:
+  """Options of a single expiry, as parallel lists sorted by strike (`calls[i]`/`puts[i]` are the names of the options at `strikes[i]`, or `None` if it's only listed on one side)."""
+  expiration_timestamp: int
+  strikes: list[Decimal] = field(default_factory=list)
+  calls: list[str | None] = field(default_factory=list)
+  puts: list[str | None] = field(default_factory=list)
+
+  def __len__(self) -> int:
+    return len(self.strikes)
+
+  def __getitem__(self, i: int) -> Strike:
+    return Strike(self.strikes[i], self.calls[i], self.puts[i])
+
+  def __iter__(self) -> Iterator[Strike]:
+    return map(Strike, self.strikes, self.calls, self.puts)
+
+  def index(self, strike: Decimal | float) -> int:
+    """Index of the strike nearest to `strike` (the lower one on ties)."""
+    if not self.strikes:
+      raise IndexError('Empty expiry')
+    i = bisect_left(self.strikes, strike)
+    if i == len(self.strikes):
+      return i - 1
+    # compare as floats: `strike` may be a float, and floats don't mix with `Decimal`s
+    x = float(strike)
+    if i > 0 and x - float(self.strikes[i-1]) <= float(self.strikes[i]) - x:
+      return i - 1
+    return i
+
+  def nearest(self, strike: Decimal | float) -> Strike:
+    return self[self.index(strike)]
+
+  def between(self, lo: Decimal | float, hi: Decimal | float) -> list[Strike]:
+    """Strikes in `[lo, hi]`, ascending."""
+    i, j = bisect_left(self.strikes, lo), bisect_right(self.strikes, hi)
+    return [self[k] for k in range(i, j)]
+
+  def around(self, spot: Decimal | float, n: int) -> list[Strike]:
+    """The ATM strike and `n` strikes on each side of it, ascending."""
+    i = self.index(spot)
+    return [self[k] for k in range(max(i-n, 0), min(i+n+1, len(self)))]
+
+@dataclass(eq=False)
+class OptionChain:
+  """Options of an underlying, indexed by expiry (sorted) and, within each expiry, by strike (see `ExpiryChain`).
+
+  Lookups are binary searches, instead of scanning the instruments. The chain is a snapshot: build a new one to pick up newly listed options.
+  """
+  expiries: list[int] = field(default_factory=list)
+  chains: dict[int, ExpiryChain] = field(default_factory=dict)
+  locations: dict[str, Location] = field(default_factory=dict, repr=False)
+
+  @classmethod
+  def from_instruments(cls, options: Iterable[Option]):
+    rows: dict[int, dict[Decimal, list[str | None]]] = {}
+    for option in options:
+      strikes = rows.setdefault(option['expiration_timestamp'], {})
+      row = strikes.setdefault(option['strike'], [None, None])
+      row[0 if option['option_type'] == 'call' else 1] = option['instrument_name']
+
+    chain = cls()
+    for expiry in sorted(rows):
+      strikes = rows[expiry]
+      sorted_strikes = sorted(strikes)
+      expiry_chain = ExpiryChain(
+        expiration_timestamp=expiry,
+        strikes=sorted_strikes,
+        calls=[strikes[k][0] for k in sorted_strikes],
+        puts=[strikes[k][1] for k in sorted_strikes],
+      )
+      for i, (_, call, put) in enumerate(expiry_chain):
+        if call is not None:
+          chain.locations[call] = Location(expiry, strike_index=i, option_type='call')
+        if put is not None:
+          chain.locations[put] = Location(expiry, strike_index=i, option_type='put')
+      chain.expiries.append(expiry)
+      chain.chains[expiry] = expiry_chain
+    return chain
+
+  @classmethod
+  def from_catalog(cls, catalog: InstrumentCatalog, base: str, quote: str | None = None):
+    """Chain of the `base`/`quote` options in `catalog`.
+
+    - `quote`: quote currency (defaults to `base`, i.e. inverse options; e.g. `'USDC'` for linear ones).
+    """
+    return cls.from_instruments(catalog.find(base, quote or base, 'option')) # type: ignore
+
+  @classmethod
+  async def load(cls, client: Client, base: str, quote: str | None = None, *, validate: bool = True):
+    """Fetch the `base`/`quote` options and build their chain (see `from_catalog`)."""
+    from deribit import MarketData
+    quote = quote or base
+    r = await MarketData(client).get_instruments(quote, kind='option', validate=validate) # type: ignore
+    if 'error' in r:
+      raise ApiError(r['error'])
+    return cls.from_instruments(
+      o for o in r['result'] # type: ignore
+      if o['base_currency'] == base and o['quote_currency'] == quote
+    )
+
+  def __len__(self) -> int:
+    return len(self.expiries)
+
+  def __getitem__(self, expiration_timestamp: int) -> ExpiryChain:
+    return self.chains[expiration_timestamp]
+
+  def __iter__(self) -> Iterator[ExpiryChain]:
+    return (self.chains[e] for e in self.expiries)
+
+  def locate(self, instrument_name: str) -> Location | None:
+    """Expiry, strike index and type of an option of the chain."""
+    return self.locations.get(instrument_name)
+
+  def next_expiry(self, timestamp: int) -> int | None:
+    """First expiry at or after `timestamp` (in milliseconds)."""
+    i = bisect_left(self.expiries, timestamp)
+    if i < len(self.expiries):
+      return self.expiries[i]
+
+  def nearest_expiry(self, timestamp: int) -> int:
+    """Expiry closest to `timestamp` (in milliseconds), e.g. to match a target tenor."""
+    if not self.expiries:
+      raise IndexError('Empty chain')
+    i = bisect_left(self.expiries, timestamp)
+    if i == len(self.expiries):
+      return self.expiries[-1]
+    if i > 0 and timestamp - self.expiries[i-1] <= self.expiries[i] - timestamp:
+      return self.expiries[i-1]
+    return self.expiries[i]
+
+  def expiries_between(self, start: int, end: int) -> list[int]:
+    """Expiries in `[start, end]` (in milliseconds)."""
+    return self.expiries[bisect_left(self.expiries, start):bisect_right(self.expiries, end)]
+
+  def atm(self, spot: Decimal | float, expiration_timestamp: int) -> Strike:
+    """Strike of the expiry nearest to `spot`."""
+    return self[expiration_timestamp].nearest(spot)
+
+  def around(self, spot: Decimal | float, n: int, expiration_timestamp: int) -> list[Strike]:
+    """The ATM strike of the expiry and `n` strikes on each side of it."""
+    return self[expiration_timestamp].around(spot, n)
@@ -0,0 +1,242 @@
+from typing_extensions import Any, Iterable, Mapping, NamedTuple
+from dataclasses import dataclass, field
+import numpy as np
+import numpy.typing as npt
+
+from deribit.core import timestamp
+from .chain import OptionChain
+
+YEAR_MS = 365 * 24 * 3600 * 1000
+SQRT_2PI = 2.506628274631
+
+# Hart's double-precision approximation of the normal CDF (as in West, "Better approximations to cumulative normal functions")
+P = [3.52624965998911e-02, 0.700383064443688, 6.37396220353165, 33.912866078383, 112.079291497871, 221.213596169931, 220.206867912376]
+Q = [8.83883476483184e-02, 1.75566716318264, 16.064177579207, 86.7807322029461, 296.564248779674, 637.333633378831, 793.826512519948, 440.413735824752]
+
+def ncdf(x: npt.NDArray) -> npt.NDArray:
+  """Standard normal CDF, accurate to ~1e-16 (NumPy has no `erf`)."""
+  a = np.abs(x)
+  e = np.exp(-a*a/2)
+  with np.errstate(all='ignore'):
+    near = e * np.polyval(P, a) / np.polyval(Q, a)
+    b = a + 0.65
+    b = a + 4/b; b = a + 3/b; b = a + 2/b; b = a + 1/b
+    far = e / b / SQRT_2PI
+  c = np.where(a < 7.07106781186547, near, far)
+  c = np.where(a > 37, 0., c)
+  return np.where(x > 0, 1 - c, c)
+
+def npdf(x: npt.NDArray) -> npt.NDArray:
+  return np.exp(-x*x/2) / SQRT_2PI
+
+def d1d2(F, K, T, sigma) -> tuple[npt.NDArray, npt.NDArray]:
+  with np.errstate(all='ignore'):
+    v = sigma * np.sqrt(T)
+    d1 = (np.log(F / K) + v*v/2) / v
+  return d1, d1 - v
+
+def black76(F, K, T, sigma, is_call) -> npt.NDArray:
+  """Undiscounted Black-76 price (in units of the forward `F`) of calls (`is_call`) or puts.
+
+  - `F`: forward (e.g. the option's `underlying_price`, or the index price).
+  - `T`: time to expiry, in years.
+  - `sigma`: volatility (e.g. `0.5` for 50%).
+  """
+  w = np.where(is_call, 1., -1.)
+  d1, d2 = d1d2(F, K, T, sigma)
+  return w * (F * ncdf(w*d1) - K * ncdf(w*d2))
+
+class Greeks(NamedTuple):
+  delta: npt.NDArray
+  """Forward delta."""
+  gamma: npt.NDArray
+  vega: npt.NDArray
+  """Per 1% of volatility."""
+  theta: npt.NDArray
+  """Per calendar day."""
+
+def greeks(F, K, T, sigma, is_call) -> Greeks:
+  """Black-76 Greeks (see `black76`), in units of the forward."""
+  d1, _ = d1d2(F, K, T, sigma)
+  sqrt_t = np.sqrt(T)
+  pdf = npdf(d1)
+  with np.errstate(all='ignore'):
+    return Greeks(
+      delta=np.where(is_call, ncdf(d1), ncdf(d1) - 1),
+      gamma=pdf / (F * sigma * sqrt_t),
+      vega=F * pdf * sqrt_t / 100,
+      theta=-F * pdf * sigma / (2 * sqrt_t) / 365,
+    )
+
+def implied_vol(
+  price, F, K, T, is_call, *,
+  guess=None, lo: float = 1e-4, hi: float = 10.,
+  tol: float = 1e-8, max_iter: int = 100,
+) -> npt.NDArray:
+  """Black-76 implied volatilities of `price`s (in units of the forward), by Newton's method safeguarded with bisection: a Newton step falling outside the current bracket (or with a vanishing vega) is replaced by bisecting it.
+
+  Vectorized over all the options; only the ones not yet converged are iterated. Prices outside the no-arbitrage bounds (or with `T <= 0`) give `nan`.
+
+  - `guess`: initial volatilities (e.g. the previous solution), where finite.
+  - `lo`, `hi`: volatility bracket.
+  - `tol`: tolerance on the volatility.
+  """
+  price, F, K, T, is_call = np.broadcast_arrays(
+    np.asarray(price, np.float64), np.asarray(F, np.float64), np.asarray(K, np.float64),
+    np.asarray(T, np.float64), np.asarray(is_call, bool),
+  )
+  shape = price.shape
+  price, F, K, T, is_call = (x.ravel() for x in (price, F, K, T, is_call))
+  out = np.full(price.shape, np.nan)
+
+  intrinsic = np.maximum(np.where(is_call, F - K, K - F), 0)
+  upper = np.where(is_call, F, K)
+  with np.errstate(invalid='ignore'):
+    idx = np.flatnonzero((T > 0) & (price > intrinsic) & (price < upper))
+
+  if guess is None:
+    sigma = np.full(len(idx), np.nan)
+  else:
+    sigma = np.broadcast_to(np.asarray(guess, np.float64), shape).ravel()[idx]
+  # Brenner-Subrahmanyam's ATM approximation as a default starting point
+  with np.errstate(all='ignore'):
+    start = price[idx] / F[idx] * np.sqrt(2 * np.pi / T[idx])
+  sigma = np.clip(np.where(np.isfinite(sigma), sigma, start), lo, hi)
+  lo_ = np.full(len(idx), lo)
+  hi_ = np.full(len(idx), hi)
+
+  for _ in range(max_iter):
+    if not len(idx):
+      break
+    f, k, t, c = F[idx], K[idx], T[idx], is_call[idx]
+    diff = black76(f, k, t, sigma, c) - price[idx]
+    d1, _ = d1d2(f, k, t, sigma)
+    vega = f * npdf(d1) * np.sqrt(t)
+    # the price increases with the volatility
+    lo_ = np.where(diff < 0, sigma, lo_)
+    hi_ = np.where(diff > 0, sigma, hi_)
+    with np.errstate(all='ignore'):
+      step = diff / vega
+    done = (np.abs(step) <= tol) | (hi_ - lo_ <= tol)
+    out[idx[done]] = sigma[done]
+    keep = ~done
+    idx, sigma, step, lo_, hi_ = idx[keep], sigma[keep], step[keep], lo_[keep], hi_[keep]
+    newton = sigma - step
+    sigma = np.where((newton > lo_) & (newton < hi_), newton, (lo_ + hi_) / 2)
+
+  return out.reshape(shape)
+
+@dataclass(eq=False)
+class ChainPricer:
+  """Implied volatilities and Greeks of a whole `OptionChain`, as flat NumPy arrays (an entry per option). Requires `numpy` (`pip install deribit-trading-sdk[numpy]`).
+
+  Feed it option prices (e.g. book mids, with `update`) and forwards (with `set_forward`), then `compute()`: only the options whose price or forward changed since the last computation are solved again, in a single vectorized pass (warm-started from their previous volatility). Moving the clock (`set_time`) reprices everything.
+
+  Greeks are in units of the forward (see `greeks`); for inverse options, delta is premium-adjusted (as reported by Deribit).
+
+  - `inverse`: option prices are quoted in the base currency (as Deribit's BTC and ETH options), instead of in units of the forward (e.g. USDC options).
+  """
+  chain: OptionChain
+  inverse: bool = True
+  now: int = field(default_factory=timestamp.now)
+  names: list[str] = field(default_factory=list, init=False, repr=False)
+  index: dict[str, int] = field(default_factory=dict, init=False, repr=False)
+  strike: npt.NDArray = field(init=False, repr=False)
+  expiry: npt.NDArray = field(init=False, repr=False)
+  is_call: npt.NDArray = field(init=False, repr=False)
+  forward: npt.NDArray = field(init=False, repr=False)
+  mark: npt.NDArray = field(init=False, repr=False)
+  """Option prices, as quoted (`nan` if unknown)."""
+  iv: npt.NDArray = field(init=False, repr=False)
+  delta: npt.NDArray = field(init=False, repr=False)
+  gamma: npt.NDArray = field(init=False, repr=False)
+  vega: npt.NDArray = field(init=False, repr=False)
+  theta: npt.NDArray = field(init=False, repr=False)
+  dirty: set[int] = field(default_factory=set, init=False, repr=False)
+
+  def __post_init__(self):
+    strikes, expiries, calls = [], [], []
+    for expiry_chain in self.chain:
+      for strike, call, put in expiry_chain:
+        for name, is_call in ((call, True), (put, False)):
+          if name is not None:
+            self.index[name] = len(self.names)
+            self.names.append(name)
+            strikes.append(float(strike))
+            expiries.append(expiry_chain.expiration_timestamp)
+            calls.append(is_call)
+    n = len(self.names)
+    self.strike = np.array(strikes, np.float64)
+    self.expiry = np.array(expiries, np.int64)
+    self.is_call = np.array(calls, bool)
+    self.forward = np.full(n, np.nan)
+    self.mark = np.full(n, np.nan)
+    self.iv = np.full(n, np.nan)
+    self.delta = np.full(n, np.nan)
+    self.gamma = np.full(n, np.nan)
+    self.vega = np.full(n, np.nan)
+    self.theta = np.full(n, np.nan)
+
+  def __len__(self) -> int:
+    return len(self.names)
+
+  def update(self, instrument_name: str, price: Any):
+    """Set the price of an option (e.g. its book mid). `None` clears it."""
+    if (i := self.index.get(instrument_name)) is not None:
+      self.mark[i] = np.nan if price is None else float(price)
+      self.dirty.add(i)
+
+  def update_many(self, prices: Mapping[str, Any]):
+    for instrument_name, price in prices.items():
+      self.update(instrument_name, price)
+
+  def update_books(self, books: Any, instrument_names: Iterable[str]):
+    """Set the prices of options to their book mids, from a `BookManager` (e.g. with the names returned by its `poll()`). Mids of books decoded as `Ticks` are scaled back to prices."""
+    for instrument_name in instrument_names:
+      book = books[instrument_name]
+      mid = book.mid()
+      if mid is not None and (ticks := book.ticks) is not None:
+        mid = mid * float(ticks.tick_size)
+      self.update(instrument_name, mid)
+
+  def set_forward(self, forward: Any, expiration_timestamp: int | None = None):
+    """Set the forward of an expiry (e.g. from its future, or the options' `underlying_price`), or of all of them (e.g. the index price, see `get_index_price`)."""
+    rows = np.flatnonzero(self.expiry == expiration_timestamp) if expiration_timestamp is not None else np.arange(len(self))
+    self.forward[rows] = float(forward)
+    self.dirty.update(rows.tolist())
+
+  def set_time(self, now: int | None = None):
+    """Move the clock (in milliseconds, defaults to now), repricing all options on the next `compute()`."""
+    self.now = timestamp.now() if now is None else now
+    self.dirty.update(range(len(self)))
+
+  def compute(self) -> npt.NDArray:
+    """Solve the implied volatilities and Greeks of the options that changed. Returns their indices."""
+    if not self.dirty:
+      return np.empty(0, np.int64)
+    rows = np.fromiter(self.dirty, np.int64, count=len(self.dirty))
+    self.dirty.clear()
+    F, K, c = self.forward[rows], self.strike[rows], self.is_call[rows]
+    T = (self.expiry[rows] - self.now) / YEAR_MS
+    price = self.mark[rows] * F if self.inverse else self.mark[rows]
+    iv = implied_vol(price, F, K, T, c, guess=self.iv[rows])
+    g = greeks(F, K, T, iv, c)
+    self.iv[rows] = iv
+    self.delta[rows] = g.delta - self.mark[rows] if self.inverse else g.delta
+    self.gamma[rows] = g.gamma
+    self.vega[rows] = g.vega
+    self.theta[rows] = g.theta
+    return rows
+
+  def greeks(self, instrument_name: str) -> dict[str, float]:
+    """Implied volatility and Greeks of an option, as of the last `compute()`."""
+    i = self.index[instrument_name]
+    return {
+      'iv': float(self.iv[i]), 'delta': float(self.delta[i]), 'gamma': float(self.gamma[i]),
+      'vega': float(self.vega[i]), 'theta': float(self.theta[i]),
+    }
+
+  def smile(self, expiration_timestamp: int, option_type: str = 'call') -> tuple[npt.NDArray, npt.NDArray]:
+    """Strikes and implied volatilities of an expiry."""
+    rows = np.flatnonzero((self.expiry == expiration_timestamp) & (self.is_call == (option_type == 'call')))
+    return self.strike[rows], self.iv[rows]
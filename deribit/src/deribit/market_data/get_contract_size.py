@@ -22,10 +22,7 @@ class GetContractSize(ClientMixin):
     
     > [Deribit API docs](https://docs.deribit.com/#public-get_contract_size)
     """
-    r = await self.get('/public/get_contract_size', {
+    return await self.get('/public/get_contract_size', {
       'instrument_name': instrument_name,
-    })
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    }, result=validate_response, validate=validate)
     
\ No newline at end of file
@@ -33,8 +33,5 @@ class GetCurrencies(ClientMixin):
     
     > [Deribit API docs](https://docs.deribit.com/#public-get_currencies)
     """
-    r = await self.get('/public/get_currencies')
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.get('/public/get_currencies', result=validate_response, validate=validate)
     
\ No newline at end of file
@@ -35,8 +35,5 @@ class GetFundingRateHistory(ClientMixin):
       'start_timestamp': ts.dump(start),
       'end_timestamp': ts.dump(end),
     }
-    r = await self.get('/public/get_funding_rate_history', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.get('/public/get_funding_rate_history', params, result=validate_response, validate=validate)
     
\ No newline at end of file
@@ -22,10 +22,7 @@ class GetIndexPrice(ClientMixin):
     
     > [Deribit API docs](https://docs.deribit.com/#public-get_index_price)
     """
-    r = await self.get('/public/get_index_price', {
+    return await self.get('/public/get_index_price', {
       'index_name': index_name,
-    })
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    }, result=validate_response, validate=validate)
     
\ No newline at end of file
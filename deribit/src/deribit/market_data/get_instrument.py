@@ -37,7 +37,7 @@ class Future(Derivative):
   max_leverage: int
   max_liquidation_commission: Decimal
 
-OptionType = Literal['oops']
+OptionType = Literal['call', 'put']
 
 class Option(Derivative):
   kind: Literal['option']
@@ -62,10 +62,7 @@ class GetInstrument(ClientMixin):
     
     > [Deribit API docs](https://docs.deribit.com/#public-get_instrument)
     """
-    r = await self.get('/public/get_instrument', {
+    return await self.get('/public/get_instrument', {
       'instrument_name': instrument_name,
-    })
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    }, result=validate_response, validate=validate)
     
\ No newline at end of file
@@ -28,8 +28,5 @@ class GetInstruments(ClientMixin):
       params['kind'] = kind
     if expired is not None:
       params['expired'] = expired
-    r = await self.get('/public/get_instruments', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.get('/public/get_instruments', params, result=validate_response, validate=validate)
     
\ No newline at end of file
@@ -4,6 +4,7 @@ from datetime import datetime
 from decimal import Decimal
 
 from deribit.core import ClientMixin, ApiResponse, validator, timestamp
+from deribit.core.numeric import Numeric, Ticks, numeric_validator
 
 class Trade(TypedDict):
   amount: Decimal
@@ -30,13 +31,15 @@ class GetLastTradesByInstrument(ClientMixin):
     end: datetime | None = None,
     count: int | None = None,
     sorting: Literal['asc', 'desc', 'default'] | None = None,
-    validate: bool = True
+    validate: bool = True,
+    numeric: Numeric | Ticks = 'decimal',
   ) -> ApiResponse[Response]:
     """Retrieves the order book for a given instrument.
     
     - `instrument_name`: The name of the instrument to get the order book for.
     - `depth`: The depth of the order book.
     - `validate`: Whether to validate the response against the expected schema.
+    - `numeric`: How to decode prices and amounts (`'decimal'`, `'float'` or integer `Ticks`). Only applies when validating.
     
     > [Deribit API docs](https://docs.deribit.com/#public-get_order_book)
     """
@@ -53,8 +56,5 @@ class GetLastTradesByInstrument(ClientMixin):
       params['count'] = count
     if sorting is not None:
       params['sorting'] = sorting
-    r = await self.get('/public/get_last_trades_by_instrument', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.get('/public/get_last_trades_by_instrument', params, result=numeric_validator(validate_response, numeric), validate=validate)
     
\ No newline at end of file
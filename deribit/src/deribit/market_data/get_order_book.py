@@ -3,6 +3,7 @@ from decimal import Decimal
 from dataclasses import dataclass
 
 from deribit.core import ClientMixin, ApiResponse, validator
+from deribit.core.numeric import Numeric, Ticks, numeric_validator
 
 class BookEntry(NamedTuple):
   price: Decimal
@@ -23,21 +24,20 @@ class GetOrderBook(ClientMixin):
   async def get_order_book(
     self, instrument_name: str, *,
     depth: int | None = None,
-    validate: bool = True
+    validate: bool = True,
+    numeric: Numeric | Ticks = 'decimal',
   ) -> ApiResponse[OrderBook]:
     """Retrieves the order book for a given instrument.
     
     - `instrument_name`: The name of the instrument to get the order book for.
     - `depth`: The depth of the order book.
     - `validate`: Whether to validate the response against the expected schema.
+    - `numeric`: How to decode prices and amounts (`'decimal'`, `'float'` or integer `Ticks`). Only applies when validating.
     
     > [Deribit API docs](https://docs.deribit.com/#public-get_order_book)
     """
     params: dict = {'instrument_name': instrument_name}
     if depth is not None:
       params['depth'] = depth
-    r = await self.get('/public/get_order_book', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.get('/public/get_order_book', params, result=numeric_validator(validate_response, numeric), validate=validate)
     
\ No newline at end of file
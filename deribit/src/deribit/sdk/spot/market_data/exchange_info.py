@@ -1,20 +1,37 @@
 from dataclasses import dataclass
 from trading_sdk.types import ApiError
 from trading_sdk.spot.market_data.exchange_info import ExchangeInfo as ExchangeInfoTDK, Info
+from deribit.core import ApiError as DeribitApiError
+from deribit.instruments import InstrumentCatalog
 from deribit.sdk.util import SdkMixin, wrap_exceptions
 
 @dataclass
 class ExchangeInfo(ExchangeInfoTDK, SdkMixin):
+  _catalog: InstrumentCatalog | None = None
+
+  async def __aexit__(self, exc_type, exc_value, traceback):
+    if self._catalog is not None:
+      self._catalog.close()
+      self._catalog = None
+    await super().__aexit__(exc_type, exc_value, traceback)
+
   @wrap_exceptions
   async def exchange_info(self, base: str, quote: str) -> Info:
+    if self._catalog is None:
+      catalog = InstrumentCatalog(self.client.client, kind='spot', validate=self.validate)
+      try:
+        await catalog.start()
+      except DeribitApiError as e:
+        raise ApiError(*e.args) from e
+      self._catalog = catalog
+
     symbol = f'{base}_{quote}'
-    r = await self.client.get_instrument(symbol)
-    if not 'result' in r:
-      raise ApiError(r['error'])
-    else:
-      info = r['result']
-      return Info(
-        tick_size=info['tick_size'],
-        step_size=info['contract_size'],
-        min_qty_=info['min_trade_amount']
-      )
+    try:
+      info = await self._catalog.instrument(symbol)
+    except DeribitApiError as e:
+      raise ApiError(*e.args) from e
+    return Info(
+      tick_size=info['tick_size'],
+      step_size=info['contract_size'],
+      min_qty_=info['min_trade_amount']
+    )
@@ -1,9 +1,11 @@
 from ._subscriptions import Subscriptions
 from .private import PrivateSubscriptions
 from .public import PublicSubscriptions
+from .demux import Demux
 
 __all__ = [
   'Subscriptions',
   'PrivateSubscriptions',
   'PublicSubscriptions',
+  'Demux',
 ]
\ No newline at end of file
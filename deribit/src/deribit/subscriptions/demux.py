@@ -0,0 +1,62 @@
+from typing_extensions import TypeVar, Generic, Any, Callable, Awaitable, AsyncIterable
+from dataclasses import dataclass, field
+import asyncio
+
+from deribit.core.ws import Subscriber, Backpressure
+
+T = TypeVar('T')
+
+def instrument_name(item: Any) -> str:
+  return item['instrument_name']
+
+@dataclass(eq=False)
+class Demux(Generic[T]):
+  """Splits a stream of mixed-instrument batches (e.g. `trades.{kind}.{currency}`) into per-instrument streams, over a single subscription.
+
+  Items of instruments without a stream are dropped. If the source stream fails, the error is raised to every instrument's consumer.
+
+  - `source`: stream of batches of items.
+  - `key`: extracts an item's instrument (defaults to its `instrument_name`).
+  - `maxsize`, `policy`: bound each instrument's queue, and choose what happens when it fills up.
+  - `unsubscribe`: cancels the source subscription, called on `close` (otherwise, the caller must unsubscribe it).
+  """
+  source: AsyncIterable[list[T]]
+  key: Callable[[T], str] = instrument_name
+  maxsize: int | None = None
+  policy: Backpressure = 'block'
+  unsubscribe: Callable[[], Awaitable] | None = None
+  streams: dict[str, Subscriber[T]] = field(default_factory=dict, init=False, repr=False)
+  pump: asyncio.Task | None = field(default=None, init=False, repr=False)
+
+  def stream(self, instrument: str) -> Subscriber[T]:
+    """Stream of `instrument`'s items (shared by all its consumers)."""
+    if (stream := self.streams.get(instrument)) is None:
+      stream = self.streams[instrument] = Subscriber(maxsize=self.maxsize, policy=self.policy)
+    if self.pump is None:
+      self.pump = asyncio.create_task(self.run())
+    return stream
+
+  def __getitem__(self, instrument: str) -> Subscriber[T]:
+    return self.stream(instrument)
+
+  async def run(self):
+    exc: Exception | None = None
+    try:
+      async for batch in self.source:
+        for item in batch:
+          if (stream := self.streams.get(self.key(item))) is not None and (pending := stream.put(item)) is not None:
+            await pending
+    except Exception as e:
+      exc = e
+    for stream in self.streams.values():
+      stream.close(exc)
+
+  async def close(self):
+    if self.pump is not None:
+      self.pump.cancel()
+      self.pump = None
+    for stream in self.streams.values():
+      stream.close()
+    if self.unsubscribe is not None:
+      unsubscribe, self.unsubscribe = self.unsubscribe, None
+      await unsubscribe()
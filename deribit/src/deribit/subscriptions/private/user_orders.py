@@ -1,7 +1,8 @@
-from typing_extensions import Literal, AsyncIterable
+from typing_extensions import Literal
 from dataclasses import dataclass
 
 from deribit.core import AuthedSocketMixin
+from deribit.core.ws import Subscriber
 from deribit.core.ws.client import SubscribeResponse
 from deribit.trading.get_order_state import OrderStatus, validate_response
 
@@ -11,7 +12,7 @@ class UserOrders(AuthedSocketMixin):
     self, instrument_name: str, *,
     interval: Literal['raw', '100ms', 'agg2'] = 'raw',
     validate: bool = True,
-  ) -> tuple[SubscribeResponse, AsyncIterable[OrderStatus]]:
+  ) -> tuple[SubscribeResponse, Subscriber[OrderStatus]]:
     """Subscribe to order changes in a given instrument.
     
     - `instrument_name`: The instrument name to subscribe to.
@@ -20,14 +21,6 @@ class UserOrders(AuthedSocketMixin):
 
     > [Deribit API docs](https://docs.deribit.com/#user-orders-instrument_name-raw)
     """
-    resp, raw_gen = await self.subscribe(f'user.orders.{instrument_name}.{interval}')
-
-    if self.validate(validate):
-      async def gen():
-        async for msg in raw_gen:
-          yield validate_response(msg)
-      return resp, gen()
-    
-    else:
-      return resp, raw_gen
+    channel = f'user.orders.{instrument_name}.{interval}'
+    return await self.subscribe(channel, validate_response if self.validate(validate) else None)
   
\ No newline at end of file
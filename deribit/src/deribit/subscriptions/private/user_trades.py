@@ -1,8 +1,11 @@
-from typing_extensions import Literal, overload, AsyncIterable
+from typing_extensions import Literal, overload
 from dataclasses import dataclass
+from functools import partial
 
 from deribit.core import AuthedSocketMixin, validator
+from deribit.core.ws import Subscriber
 from deribit.core.ws.client import SubscribeResponse
+from deribit.subscriptions.demux import Demux
 from deribit.trading.get_user_trades_by_currency import Trade
 
 validate_message = validator(list[Trade])
@@ -16,7 +19,7 @@ class UserTrades(AuthedSocketMixin):
     self, *, instrument_name: str,
     interval: Literal['raw', '100ms', 'agg2'] = 'raw',
     validate: bool = True,
-  ) -> tuple[SubscribeResponse, AsyncIterable[list[Trade]]]:
+  ) -> tuple[SubscribeResponse, Subscriber[list[Trade]]]:
     """Subscribe to user trades in a given instrument.
     
     - `instrument_name`: The instrument name to subscribe to.
@@ -32,7 +35,7 @@ class UserTrades(AuthedSocketMixin):
     currency: str | Literal['any'] = 'any',
     interval: Literal['raw', '100ms', 'agg2'] = 'raw',
     validate: bool = True,
-  ) -> tuple[SubscribeResponse, AsyncIterable[list[Trade]]]:
+  ) -> tuple[SubscribeResponse, Subscriber[list[Trade]]]:
     """Subscribe to user trades in a given currency, optionally filtered by instrument kind.
     
     - `kind`: The instrument kind to subscribe to.
@@ -54,14 +57,23 @@ class UserTrades(AuthedSocketMixin):
     else:
       channel = f'user.trades.{kind}.{currency}.{interval}'
     
-    resp, raw_gen = await self.subscribe(channel)
+    return await self.subscribe(channel, validate_message if self.validate(validate) else None)
 
-    if self.validate(validate):
-      async def gen():
-        async for msg in raw_gen:
-          yield validate_message(msg)
-      return resp, gen()
+  async def user_trades_by_instrument(
+    self, *, kind: InstrumentKind = 'any',
+    currency: str | Literal['any'] = 'any',
+    interval: Literal['raw', '100ms', 'agg2'] = 'raw',
+    validate: bool = True,
+  ) -> tuple[SubscribeResponse, Demux[Trade]]:
+    """Subscribe once to user trades in a given currency and kind, and split them by instrument: `demux.stream(instrument_name)` yields the trades of each instrument.
     
-    else:
-      return resp, raw_gen
-  
\ No newline at end of file
+    - `kind`: The instrument kind to subscribe to.
+    - `currency`: The currency to subscribe to.
+    - `interval`: The interval to subscribe to.
+    - `validate`: Whether to validate the response against the expected schema.
+
+    > [Deribit API docs](https://docs.deribit.com/#user-trades-kind-currency-interval)
+    """
+    r, stream = await self.user_trades(kind=kind, currency=currency, interval=interval, validate=validate)
+    channel = f'user.trades.{kind}.{currency}.{interval}'
+    return r, Demux(stream, unsubscribe=partial(self.client.unsubscribe, channel, stream))
@@ -1,7 +1,9 @@
-from typing_extensions import Literal, TypedDict, AsyncIterable
+from typing_extensions import Literal, TypedDict, overload
 from dataclasses import dataclass
 
-from deribit.core import SocketMixin, ApiResponse, validator
+from deribit.core import SocketMixin, validator
+from deribit.core.numeric import Numeric, Ticks, numeric_validator
+from deribit.core.ws import Subscriber, LatestSubscriber
 from deribit.core.ws.client import SubscribeResponse
 from deribit.market_data.get_order_book import BookEntry
 
@@ -16,13 +18,16 @@ validate_message = validator(OrderBook)
 
 @dataclass(frozen=True)
 class Depth(SocketMixin):
+  @overload
   async def depth(
     self, instrument_name: str, *,
     group: int | Literal['none'] = 'none',
     depth: int = 20,
     interval: Literal['100ms', 'agg2'] = '100ms',
     validate: bool = True,
-  ) -> tuple[SubscribeResponse, AsyncIterable[OrderBook]]:
+    numeric: Numeric | Ticks = 'decimal',
+    conflate: Literal[False] = False,
+  ) -> tuple[SubscribeResponse, Subscriber[OrderBook]]:
     """Subscribes to the order book for a certain instrument.
     
     - `instrument_name`: The instrument name to subscribe to.
@@ -30,17 +35,45 @@ class Depth(SocketMixin):
     - `depth`: Number of price levels to include (1, 10, or 20).
     - `interval`: Frequency of notifications.
     - `validate`: Whether to validate the response against the expected schema.
+    - `numeric`: How to decode prices and amounts (`'decimal'`, `'float'` or integer `Ticks`). Only applies when validating.
+    - `conflate`: Whether to keep only the latest book (see below).
 
     > [Deribit API docs](https://docs.deribit.com/#book-instrument_name-group-depth-interval)
     """
-    resp, raw_gen = await self.subscribe(f'book.{instrument_name}.{group}.{depth}.{interval}')
-
-    if self.validate(validate):
-      async def gen():
-        async for msg in raw_gen:
-          yield validate_message(msg)
-      return resp, gen()
+    ...
+  @overload
+  async def depth(
+    self, instrument_name: str, *,
+    group: int | Literal['none'] = 'none',
+    depth: int = 20,
+    interval: Literal['100ms', 'agg2'] = '100ms',
+    validate: bool = True,
+    numeric: Numeric | Ticks = 'decimal',
+    conflate: Literal[True],
+  ) -> tuple[SubscribeResponse, LatestSubscriber[OrderBook]]:
+    """Subscribes to the latest order book for a certain instrument. Intermediate books are discarded if not consumed in time: the stream yields `(book, skipped)`, where `skipped` is the number of books discarded since the previous one.
     
+    - `instrument_name`: The instrument name to subscribe to.
+    - `group`: Price grouping by rounding. See the [docs](https://docs.deribit.com/#book-instrument_name-group-depth-interval) for details.
+    - `depth`: Number of price levels to include (1, 10, or 20).
+    - `interval`: Frequency of notifications.
+    - `validate`: Whether to validate the response against the expected schema.
+    - `numeric`: How to decode prices and amounts (`'decimal'`, `'float'` or integer `Ticks`). Only applies when validating.
+
+    > [Deribit API docs](https://docs.deribit.com/#book-instrument_name-group-depth-interval)
+    """
+  async def depth(
+    self, instrument_name: str, *,
+    group: int | Literal['none'] = 'none',
+    depth: int = 20,
+    interval: Literal['100ms', 'agg2'] = '100ms',
+    validate: bool = True,
+    numeric: Numeric | Ticks = 'decimal',
+    conflate: bool = False,
+  ):
+    channel = f'book.{instrument_name}.{group}.{depth}.{interval}'
+    parser = numeric_validator(validate_message, numeric) if self.validate(validate) else None
+    if conflate:
+      return await self.subscribe_latest(channel, parser)
     else:
-      return resp, raw_gen
-  
\ No newline at end of file
+      return await self.subscribe(channel, parser)
@@ -4,6 +4,7 @@ from decimal import Decimal
 import asyncio
 
 from deribit.core import SocketMixin, validator
+from deribit.core.numeric import Numeric, Ticks, numeric_validator
 from deribit.core.ws.client import SubscribeResponse
 
 class BookEntryUpdate(NamedTuple):
@@ -27,12 +28,17 @@ class OrderBookSnapshot(BaseOrderBook):
   type: Literal['snapshot']
 
 class OrderBookUpdate(BaseOrderBook):
+  prev_change_id: int
   asks: list[BookEntryUpdate]
   bids: list[BookEntryUpdate]
   type: Literal['change']
 
+OrderBookMessage = OrderBookSnapshot | OrderBookUpdate
+
 validate_snapshot = validator(OrderBookSnapshot)
 validate_update = validator(OrderBookUpdate)
+OrderBookMessageT: type[OrderBookMessage] = OrderBookMessage # type: ignore
+validate_message = validator(OrderBookMessageT)
 
 @dataclass(frozen=True)
 class DepthUpdates(SocketMixin):
@@ -40,16 +46,19 @@ class DepthUpdates(SocketMixin):
     self, instrument_name: str, *,
     interval: Literal['100ms', 'agg2', 'raw'] = 'raw',
     validate: bool = True,
+    numeric: Numeric | Ticks = 'decimal',
   ) -> tuple[SubscribeResponse, Awaitable[OrderBookSnapshot], AsyncIterable[OrderBookUpdate]]:
     """Subscribes to changes to the order book for a certain instrument.
     
     - `instrument_name`: The instrument name to subscribe to.
     - `interval`: Frequency of notifications.
     - `validate`: Whether to validate the response against the expected schema.
+    - `numeric`: How to decode prices and amounts (`'decimal'`, `'float'` or integer `Ticks`). Only applies when validating.
 
     > [Deribit API docs](https://docs.deribit.com/#book-instrument_name-interval)
     """
-    resp, raw_gen = await self.subscribe(f'book.{instrument_name}.{interval}')
+    channel = f'book.{instrument_name}.{interval}'
+    resp, raw_gen = await self.subscribe(channel, numeric_validator(validate_message, numeric) if self.validate(validate) else None)
     
     snapshot = asyncio.Future[OrderBookSnapshot]()
     it = aiter(raw_gen)
@@ -57,27 +66,15 @@ class DepthUpdates(SocketMixin):
     async def first():
       try:
         msg = await anext(it)
-        if self.validate(validate):
-          msg = validate_snapshot(msg)
-        else:
-          msg = cast(OrderBookSnapshot, msg)
-        snapshot.set_result(msg)
+        snapshot.set_result(cast(OrderBookSnapshot, msg))
       except StopAsyncIteration:
         ...
     asyncio.create_task(first())
 
     async def gen():
       await snapshot
-      while True:
-        try:
-          msg = await anext(it)
-          if self.validate(validate):
-            msg = validate_update(msg)
-          else:
-            msg = cast(OrderBookUpdate, msg)
-          yield msg
-        except StopAsyncIteration:
-          break
+      async for msg in it:
+        yield cast(OrderBookUpdate, msg)
     
     return resp, snapshot, gen()
   
\ No newline at end of file
@@ -1,8 +1,12 @@
-from typing_extensions import Literal, overload, AsyncIterable
+from typing_extensions import Literal, overload
 from dataclasses import dataclass
+from functools import partial
 
 from deribit.core import SocketMixin, validator
+from deribit.core.numeric import Numeric, Ticks, numeric_validator
+from deribit.core.ws import Subscriber
 from deribit.core.ws.client import SubscribeResponse
+from deribit.subscriptions.demux import Demux
 from deribit.market_data.get_last_trades_by_instrument import Trade
 
 validate_message = validator(list[Trade])
@@ -16,12 +20,14 @@ class Trades(SocketMixin):
     self, *, instrument_name: str,
     interval: Literal['raw', '100ms', 'agg2'] = 'raw',
     validate: bool = True,
-  ) -> tuple[SubscribeResponse, AsyncIterable[list[Trade]]]:
+    numeric: Numeric | Ticks = 'decimal',
+  ) -> tuple[SubscribeResponse, Subscriber[list[Trade]]]:
     """Subscribe to trades in a given instrument.
     
     - `instrument_name`: The instrument name to subscribe to.
     - `interval`: The interval to subscribe to.
     - `validate`: Whether to validate the response against the expected schema.
+    - `numeric`: How to decode prices and amounts (`'decimal'`, `'float'` or integer `Ticks`). Only applies when validating.
 
     > [Deribit API docs](https://docs.deribit.com/#trades-instrument_name-interval)
     """
@@ -32,13 +38,15 @@ class Trades(SocketMixin):
     currency: str | Literal['any'] = 'any',
     interval: Literal['raw', '100ms', 'agg2'] = 'raw',
     validate: bool = True,
-  ) -> tuple[SubscribeResponse, AsyncIterable[list[Trade]]]:
+    numeric: Numeric | Ticks = 'decimal',
+  ) -> tuple[SubscribeResponse, Subscriber[list[Trade]]]:
     """Subscribe to trades in a given currency, optionally filtered by instrument kind.
     
     - `kind`: The instrument kind to subscribe to.
     - `currency`: The currency to subscribe to.
     - `interval`: The interval to subscribe to.
     - `validate`: Whether to validate the response against the expected schema.
+    - `numeric`: How to decode prices and amounts (`'decimal'`, `'float'` or integer `Ticks`). Only applies when validating.
 
     > [Deribit API docs](https://docs.deribit.com/#trades-instrument_name-interval)
     """
@@ -48,6 +56,7 @@ class Trades(SocketMixin):
     currency: str | Literal['any'] = 'any',
     interval: Literal['raw', '100ms', 'agg2'] = 'raw',
     validate: bool = True,
+    numeric: Numeric | Ticks = 'decimal',
   ):
     if instrument_name is not None:
       channel = f'trades.{instrument_name}.{interval}'
@@ -56,14 +65,25 @@ class Trades(SocketMixin):
     else:
       raise ValueError('Must provide either instrument_name or kind')
     
-    resp, raw_gen = await self.subscribe(channel)
+    return await self.subscribe(channel, numeric_validator(validate_message, numeric) if self.validate(validate) else None)
 
-    if self.validate(validate):
-      async def gen():
-        async for msg in raw_gen:
-          yield validate_message(msg)
-      return resp, gen()
+  async def trades_by_instrument(
+    self, *, kind: InstrumentKind,
+    currency: str | Literal['any'] = 'any',
+    interval: Literal['raw', '100ms', 'agg2'] = 'raw',
+    validate: bool = True,
+    numeric: Numeric | Ticks = 'decimal',
+  ) -> tuple[SubscribeResponse, Demux[Trade]]:
+    """Subscribe once to trades in a given currency and kind, and split them by instrument: `demux.stream(instrument_name)` yields the trades of each instrument.
     
-    else:
-      return resp, raw_gen
-  
\ No newline at end of file
+    - `kind`: The instrument kind to subscribe to.
+    - `currency`: The currency to subscribe to.
+    - `interval`: The interval to subscribe to.
+    - `validate`: Whether to validate the response against the expected schema.
+    - `numeric`: How to decode prices and amounts (`'decimal'`, `'float'` or integer `Ticks`). Only applies when validating.
+
+    > [Deribit API docs](https://docs.deribit.com/#trades-kind-currency-interval)
+    """
+    r, stream = await self.trades(kind=kind, currency=currency, interval=interval, validate=validate, numeric=numeric)
+    channel = f'trades.{kind}.{currency}.{interval}'
+    return r, Demux(stream, unsubscribe=partial(self.client.unsubscribe, channel, stream))
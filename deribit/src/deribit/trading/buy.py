@@ -90,8 +90,5 @@ class Buy(AuthedClientMixin):
     > [Deribit API docs](https://docs.deribit.com/#private-buy)
     """
     params = {**order, 'instrument_name': instrument_name}
-    r = await self.authed_request('/private/buy', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.authed_request('/private/buy', params, result=validate_response, validate=validate)
   
\ No newline at end of file
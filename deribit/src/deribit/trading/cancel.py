@@ -19,8 +19,5 @@ class Cancel(AuthedClientMixin):
     > [Deribit API docs](https://docs.deribit.com/#private-cancel)
     """
     params = {'order_id': orderId}
-    r = await self.authed_request('/private/cancel', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.authed_request('/private/cancel', params, result=validate_response, validate=validate)
   
\ No newline at end of file
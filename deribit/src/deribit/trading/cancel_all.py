@@ -20,8 +20,5 @@ class CancelAll(AuthedClientMixin):
     > [Deribit API docs](https://docs.deribit.com/#private-cancel_all)
     """
     params = kwargs
-    r = await self.authed_request('/private/cancel_all', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.authed_request('/private/cancel_all', params, result=validate_response, validate=validate)
   
\ No newline at end of file
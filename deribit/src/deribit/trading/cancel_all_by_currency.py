@@ -34,8 +34,5 @@ class CancelAllByCurrency(AuthedClientMixin):
       params['kind'] = kind
     if type is not None:
       params['type'] = type
-    r = await self.authed_request('/private/cancel_all_by_currency', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.authed_request('/private/cancel_all_by_currency', params, result=validate_response, validate=validate)
   
\ No newline at end of file
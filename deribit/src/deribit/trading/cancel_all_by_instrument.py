@@ -27,8 +27,5 @@ class CancelAllByInstrument(AuthedClientMixin):
     params = {'instrument_name': instrument_name, **kwargs}
     if type is not None:
       params['type'] = type
-    r = await self.authed_request('/private/cancel_all_by_instrument', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.authed_request('/private/cancel_all_by_instrument', params, result=validate_response, validate=validate)
   
\ No newline at end of file
@@ -27,8 +27,5 @@ class CancelByLabel(AuthedClientMixin):
     params = {'label': label, **kwargs}
     if currency is not None:
       params['currency'] = currency
-    r = await self.authed_request('/private/cancel_by_label', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.authed_request('/private/cancel_by_label', params, result=validate_response, validate=validate)
   
\ No newline at end of file
@@ -30,8 +30,5 @@ class Edit(AuthedClientMixin):
       params['amount'] = amount
     if price is not None:
       params['price'] = price
-    r = await self.authed_request('/private/edit', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.authed_request('/private/edit', params, result=validate_response, validate=validate)
   
\ No newline at end of file
@@ -33,8 +33,5 @@ class EditByLabel(AuthedClientMixin):
       params['amount'] = amount
     if price is not None:
       params['price'] = price
-    r = await self.authed_request('/private/edit_by_label', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.authed_request('/private/edit_by_label', params, result=validate_response, validate=validate)
   
\ No newline at end of file
@@ -25,8 +25,5 @@ class GetOpenOrdersByCurrency(AuthedClientMixin):
       params['kind'] = kind
     if type is not None:
       params['type'] = type
-    r = await self.authed_request('/private/get_open_orders_by_currency', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.authed_request('/private/get_open_orders_by_currency', params, result=validate_response, validate=validate)
   
\ No newline at end of file
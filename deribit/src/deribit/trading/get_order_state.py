@@ -39,8 +39,5 @@ class GetOrderState(AuthedClientMixin):
     > [Deribit API docs](https://docs.deribit.com/#private-get_order_state)
     """
     params = {'order_id': orderId}
-    r = await self.authed_request('/private/get_order_state', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.authed_request('/private/get_order_state', params, result=validate_response, validate=validate)
   
\ No newline at end of file
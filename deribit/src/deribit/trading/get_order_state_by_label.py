@@ -20,8 +20,5 @@ class GetOrderStateByLabel(AuthedClientMixin):
     > [Deribit API docs](https://docs.deribit.com/#private-get_order_state_by_label)
     """
     params = {'currency': currency, 'label': label}
-    r = await self.authed_request('/private/get_order_state_by_label', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.authed_request('/private/get_order_state_by_label', params, result=validate_response, validate=validate)
   
\ No newline at end of file
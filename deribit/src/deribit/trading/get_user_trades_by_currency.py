@@ -82,8 +82,5 @@ class GetUserTradesByCurrency(AuthedClientMixin):
       params['historical'] = historical
     if subaccount_id is not None:
       params['subaccount_id'] = subaccount_id
-    r = await self.authed_request('/private/get_user_trades_by_currency', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.authed_request('/private/get_user_trades_by_currency', params, result=validate_response, validate=validate)
   
\ No newline at end of file
@@ -47,10 +47,7 @@ class GetUserTradesByInstrument(AuthedClientMixin):
       params['sorting'] = sorting
     if historical is not None:
       params['historical'] = historical
-    r = await self.authed_request('/private/get_user_trades_by_instrument', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.authed_request('/private/get_user_trades_by_instrument', params, result=validate_response, validate=validate)
   
   async def get_user_trades_by_instrument_paged(
     self, instrument_name: str, *,
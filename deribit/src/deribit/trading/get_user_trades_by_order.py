@@ -26,8 +26,5 @@ class GetUserTradesByOrder(AuthedClientMixin):
       params['sorting'] = sorting
     if historical is not None:
       params['historical'] = historical
-    r = await self.authed_request('/private/get_user_trades_by_order', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.authed_request('/private/get_user_trades_by_order', params, result=validate_response, validate=validate)
   
\ No newline at end of file
@@ -18,8 +18,5 @@ class Sell(AuthedClientMixin):
     > [Deribit API docs](https://docs.deribit.com/#private-sell)
     """
     params = {**order, 'instrument_name': instrument_name}
-    r = await self.authed_request('/private/sell', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.authed_request('/private/sell', params, result=validate_response, validate=validate)
     
\ No newline at end of file
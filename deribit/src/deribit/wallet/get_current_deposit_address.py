@@ -24,8 +24,5 @@ class GetCurrentDepositAddress(AuthedClientMixin):
     > [Deribit API docs](https://docs.deribit.com/#private-get_current_deposit_address)
     """
     params = {'currency': currency}
-    r = await self.authed_request('/private/get_current_deposit_address', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.authed_request('/private/get_current_deposit_address', params, result=validate_response, validate=validate)
   
\ No newline at end of file
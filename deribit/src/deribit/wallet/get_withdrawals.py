@@ -48,10 +48,7 @@ class GetWithdrawals(AuthedClientMixin):
       params['count'] = count
     if offset is not None:
       params['offset'] = offset
-    r = await self.authed_request('/private/get_withdrawals', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.authed_request('/private/get_withdrawals', params, result=validate_response, validate=validate)
   
   async def get_withdrawals_paged(
     self, currency: str, *,
@@ -32,8 +32,5 @@ class Withdraw(AuthedClientMixin):
     }
     if priority is not None:
       params['priority'] = priority
-    r = await self.authed_request('/private/withdraw', params)
-    if self.validate(validate) and 'result' in r:
-      r['result'] = validate_response(r['result'])
-    return r
+    return await self.authed_request('/private/withdraw', params, result=validate_response, validate=validate)
   
\ No newline at end of file